@@ -4,6 +4,8 @@ Minecraft Mod Update Checker
 A tool for checking and updating Minecraft mods from Modrinth and CurseForge.
 """
 
+from typing import Any
+
 from data.__version__ import (
     __version__,
     __author__,
@@ -13,8 +15,7 @@ from data.__version__ import (
     get_version_string,
     get_version_info,
     get_version_tuple,
-    get_user_agent_string,
-    VERSION_INFO
+    get_user_agent_string
 )
 
 # Make version information accessible at package level
@@ -31,3 +32,24 @@ __all__ = [
     'VERSION_INFO'
 ]
 
+
+def __getattr__(name: str) -> Any:
+    """
+    Lazily re-export attributes that are expensive to build.
+
+    Importing VERSION_INFO eagerly would defeat the deferred build in
+    data.__version__ for every `import data.*`.
+
+    Args:
+        name: Attribute being looked up
+
+    Returns:
+        The resolved attribute
+    """
+    if name == "VERSION_INFO":
+        # importlib rather than an import statement: the __version__
+        # string bound above shadows the submodule of the same name
+        import importlib
+        return importlib.import_module("data.__version__").VERSION_INFO
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
@@ -5,6 +5,7 @@ This module provides version information and metadata for the NyxPatcher applica
 """
 
 import datetime
+import functools
 from typing import Dict, Any, Tuple
 
 # Version information
@@ -26,23 +27,39 @@ VERSION_PATCH = int(VERSION_PARTS[2])
 
 # Build information
 BUILD_DATE = __release_date__
-BUILD_TIMESTAMP = datetime.datetime.now().isoformat()
-
-# Version info dictionary with metadata
-VERSION_INFO = {
-    "version": __version__,
-    "major": VERSION_MAJOR,
-    "minor": VERSION_MINOR,
-    "patch": VERSION_PATCH,
-    "release_date": __release_date__,
-    "build_date": BUILD_DATE,
-    "build_timestamp": BUILD_TIMESTAMP,
-    "author": __author__,
-    "license": __license__,
-    "description": __description__,
-    "name": PACKAGE_NAME,
-    "repository": REPOSITORY_URL
-}
+
+
+@functools.cache
+def _version_info() -> Dict[str, Any]:
+    """Build the version info dictionary on first use."""
+    return {
+        "version": __version__,
+        "major": VERSION_MAJOR,
+        "minor": VERSION_MINOR,
+        "patch": VERSION_PATCH,
+        "release_date": __release_date__,
+        "build_date": BUILD_DATE,
+        "build_timestamp": datetime.datetime.now().isoformat(),
+        "author": __author__,
+        "license": __license__,
+        "description": __description__,
+        "name": PACKAGE_NAME,
+        "repository": REPOSITORY_URL
+    }
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Lazily resolve attributes that are expensive to build at import time.
+
+    Keeps VERSION_INFO and BUILD_TIMESTAMP available as module attributes
+    without paying for them on every import.
+    """
+    if name == "VERSION_INFO":
+        return _version_info()
+    if name == "BUILD_TIMESTAMP":
+        return _version_info()["build_timestamp"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_version_string() -> str:
@@ -72,13 +89,17 @@ def get_version_info() -> Dict[str, Any]:
     Returns:
         Dictionary containing version information and metadata
     """
-    return VERSION_INFO.copy()
+    return _version_info().copy()
 
 
+@functools.cache
 def get_user_agent_string() -> str:
     """
     Get a formatted User-Agent string including the version.
-    
+
+    Cached: the string is constant for the process and callers on the
+    download path ask for it repeatedly.
+
     Returns:
         User-Agent string for HTTP requests
     """
@@ -1,62 +1,555 @@
-"""
-Base classes for API providers.
-"""
-
-from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
-
-
-class BaseProvider(ABC):
-    """Base class for mod repository API providers."""
-
-    @abstractmethod
-    def get_project_id(self, mod_id: str) -> Optional[str]:
-        """
-        Get the project ID for a mod from this provider.
-        
-        Args:
-            mod_id: The mod ID to look up
-            
-        Returns:
-            Project ID string or None if not found
-        """
-        pass
-    
-    @abstractmethod
-    def get_latest_version(
-        self, 
-        project_id: str, 
-        game_version: str, 
-        mod_loader: str
-    ) -> Optional[Dict[str, Any]]:
-        """
-        Get the latest version info for a mod.
-        
-        Args:
-            project_id: The provider-specific project ID
-            game_version: Minecraft version to filter by (e.g. "1.20.4")
-            mod_loader: Mod loader to filter by (e.g. "fabric", "forge", "quilt")
-            
-        Returns:
-            Dictionary containing version information or None if not found
-        """
-        pass
-    
-    @abstractmethod
-    def download_mod(
-        self, 
-        version_info: Dict[str, Any], 
-        output_path: str
-    ) -> bool:
-        """
-        Download a mod version to the specified path.
-        
-        Args:
-            version_info: Version information dictionary
-            output_path: Path where the file should be saved
-            
-        Returns:
-            True if download was successful, False otherwise
-        """
-        pass
-
+"""
+Base classes for API providers.
+"""
+
+import os
+import logging
+import random
+import shutil
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+
+from data.api.http_cache import (
+    CachedResponse,
+    ResponseCache,
+    get_response_cache,
+    ttl_for_url
+)
+
+# orjson parses JSON several times faster than the stdlib; fall back to
+# the response's own decoder if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def parse_json(response: Any) -> Any:
+    """
+    Decode a JSON response body.
+
+    Args:
+        response: Response object with .content/.json()
+
+    Returns:
+        Decoded JSON data (dict or list)
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# Maximum number of requests allowed in flight at once when a provider
+# is driven from multiple worker threads
+MAX_CONCURRENT_REQUESTS = 10
+
+# Default client-side request rate when a subclass doesn't set one
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+
+
+class _TokenBucket:
+    """Monotonic-clock token bucket for client-side rate limiting."""
+
+    def __init__(self, rate: float):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Sustained requests per second; burst capacity matches
+                one second's worth of tokens (minimum 1)
+        """
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Adaptive throttle state: the rate drops after a 429 and
+        # recovers to the configured baseline once the penalty expires
+        self._base_rate = rate
+        self._restore_at: Optional[float] = None
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+
+                # Penalty window over: recover the configured rate
+                if self._restore_at is not None and now >= self._restore_at:
+                    self.rate = self._base_rate
+                    self._restore_at = None
+
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait_time = (1 - self.tokens) / self.rate
+
+            time.sleep(wait_time)
+
+    def penalize(self, factor: float = 0.8, recovery_seconds: float = 60.0) -> None:
+        """
+        Cut the sustained rate after a server-side rate limit.
+
+        Args:
+            factor: Multiplier applied to the current rate (floored at
+                10% of the configured baseline)
+            recovery_seconds: How long until the baseline rate returns
+        """
+        with self._lock:
+            now = time.monotonic()
+            # Settle accrued tokens at the old rate before changing it
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.rate = max(self._base_rate * 0.1, self.rate * factor)
+            self._restore_at = now + recovery_seconds
+
+# Files below this size aren't worth splitting into ranges
+MIN_RANGED_DOWNLOAD_SIZE = 4 * 1024 * 1024  # 4 MiB
+
+# Number of parallel ranges per download
+RANGED_DOWNLOAD_PARTS = 4
+
+
+class BaseProvider(ABC):
+    """
+    Base class for mod repository API providers.
+
+    Owns the shared HTTP machinery — pooled session, retry/backoff loop,
+    response caching, concurrency gating and streaming downloads — so the
+    concrete providers only supply auth headers, endpoint logic and any
+    provider-specific URL indirection.
+    """
+
+    # Parent directories already created this run, shared across provider
+    # instances so repeated downloads into the same folder skip the stat
+    _created_dirs: set = set()
+
+    def __init__(
+        self,
+        headers: Dict[str, str],
+        max_requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND
+    ):
+        """
+        Initialize the shared provider state.
+
+        Args:
+            headers: Default headers for every request (auth, user agent)
+            max_requests_per_second: Client-side request rate cap, tuned
+                per provider to stay under the API's documented limits
+        """
+        self.headers = headers
+        self.max_retries = 3
+        self.retry_delay = 1  # seconds
+        self.logger = logging.getLogger(type(self).__module__)
+
+        # Use a persistent session so TCP/TLS connections are reused
+        # across requests instead of being re-established per call
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+        )
+
+        # Bound per-host concurrency so parallel callers cannot overwhelm
+        # the API or exhaust the connection pool
+        self._request_gate = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+        # Throttle outgoing requests proactively rather than relying on
+        # reactive 429 backoff
+        self._rate_limiter = _TokenBucket(max_requests_per_second)
+
+        # Disk-backed cache for GET responses (None if disabled)
+        self.response_cache = get_response_cache()
+
+        # In-process memoization for repeated lookups within a run
+        self._project_id_cache: Dict[str, Optional[str]] = {}
+
+    def _start_connection_warmup(self, base_url: str) -> None:
+        """
+        Warm up DNS/TCP/TLS to the API host in the background.
+
+        Fired from subclass __init__ so the first real request finds a
+        hot socket instead of paying the handshake on the critical path.
+        Purely best-effort: all failures are swallowed.
+
+        Args:
+            base_url: URL of the API host to connect to
+        """
+        def _warm_up() -> None:
+            try:
+                self.session.head(base_url, timeout=2)
+            except Exception:
+                pass  # best-effort only
+
+        threading.Thread(target=_warm_up, daemon=True).start()
+
+    def _ensure_parent_dir(self, output_path: str) -> None:
+        """
+        Create the parent directory of a download target once per process.
+
+        Args:
+            output_path: Path the file will be written to
+        """
+        parent = str(Path(output_path).parent)
+        if parent not in BaseProvider._created_dirs:
+            Path(parent).mkdir(parents=True, exist_ok=True)
+            BaseProvider._created_dirs.add(parent)
+
+    @abstractmethod
+    def get_project_id(self, mod_id: str) -> Optional[str]:
+        """
+        Get the project ID for a mod from this provider.
+
+        Args:
+            mod_id: The mod ID to look up
+
+        Returns:
+            Project ID string or None if not found
+        """
+        pass
+
+    @abstractmethod
+    def get_latest_version(
+        self,
+        project_id: str,
+        game_version: str,
+        mod_loader: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest version info for a mod.
+
+        Args:
+            project_id: The provider-specific project ID
+            game_version: Minecraft version to filter by (e.g. "1.20.4")
+            mod_loader: Mod loader to filter by (e.g. "fabric", "forge", "quilt")
+
+        Returns:
+            Dictionary containing version information or None if not found
+        """
+        pass
+
+    def _preprocess_download_url(self, download_url: str) -> Optional[str]:
+        """
+        Hook for providers that need to resolve indirect download URLs.
+
+        Args:
+            download_url: URL taken from the version info
+
+        Returns:
+            A directly fetchable URL, or None if resolution failed
+        """
+        return download_url
+
+    def download_mod(
+        self,
+        version_info: Dict[str, Any],
+        output_path: str
+    ) -> bool:
+        """
+        Download a mod version to the specified path.
+
+        Args:
+            version_info: Version information dictionary from get_latest_version
+            output_path: Path where the file should be saved
+
+        Returns:
+            True if download was successful, False otherwise
+        """
+        try:
+            # Get download URL from version info
+            files = version_info.get('files', [])
+            if not files:
+                self.logger.warning("No download files available in version info")
+                return False
+
+            # Use the primary file (first in the list)
+            download_url = files[0].get('url')
+            if not download_url:
+                self.logger.warning("No download URL available in version info")
+                return False
+
+            # Resolve provider-specific URL indirection
+            download_url = self._preprocess_download_url(download_url)
+            if not download_url:
+                return False
+
+            # Try a parallel ranged download first; fall back to a single stream
+            if self._download_ranged(download_url, output_path):
+                self.logger.info(f"Successfully downloaded mod to {output_path}")
+                return True
+
+            # Download the file
+            response = self._make_request("GET", download_url, stream=True)
+            if not response:
+                return False
+
+            # Get file size for progress bar
+            total_size = int(response.headers.get('content-length', 0))
+
+            # Ensure directory exists
+            self._ensure_parent_dir(output_path)
+
+            # Stream straight from the socket to disk with a large
+            # buffer; the copy loop runs in C instead of per-chunk Python
+            response.raw.decode_content = True
+            with open(output_path, 'wb') as f:
+                with tqdm.wrapattr(
+                    f,
+                    "write",
+                    total=total_size,
+                    unit='B',
+                    unit_scale=True,
+                    desc=Path(output_path).name,
+                    leave=False
+                ) as wrapped:
+                    shutil.copyfileobj(response.raw, wrapped, length=1 << 20)  # 1 MiB
+
+            self.logger.info(f"Successfully downloaded mod to {output_path}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error downloading mod: {str(e)}")
+            return False
+
+    def _download_ranged(
+        self,
+        url: str,
+        output_path: str,
+        parts: int = RANGED_DOWNLOAD_PARTS
+    ) -> bool:
+        """
+        Download a file with parallel ranged GET requests.
+
+        Splits the file into byte ranges fetched concurrently and written
+        at their offsets, which fills the pipe much faster than a single
+        TCP stream on large files. Falls back (returns False) when the
+        server does not advertise range support or the file is small.
+
+        Args:
+            url: URL to download
+            output_path: Path where the file should be saved
+            parts: Number of parallel ranges to fetch
+
+        Returns:
+            True if the ranged download succeeded, False if the caller
+            should fall back to a single-stream download
+        """
+        try:
+            head = self.session.head(url, allow_redirects=True, timeout=30)
+            head.raise_for_status()
+
+            total_size = int(head.headers.get('content-length', 0))
+            supports_ranges = head.headers.get('accept-ranges', '').lower() == 'bytes'
+
+            if not supports_ranges or total_size < MIN_RANGED_DOWNLOAD_SIZE:
+                return False
+
+            # Split the file into contiguous byte ranges
+            ranges = [
+                (i * total_size // parts, (i + 1) * total_size // parts - 1)
+                for i in range(parts)
+            ]
+
+            # Ensure directory exists and pre-allocate the file
+            self._ensure_parent_dir(output_path)
+            with open(output_path, 'wb') as f:
+                f.truncate(total_size)
+
+            with open(output_path, 'r+b') as f:
+                fd = f.fileno()
+
+                with tqdm(
+                    total=total_size,
+                    unit='B',
+                    unit_scale=True,
+                    desc=Path(output_path).name,
+                    leave=False
+                ) as pbar:
+                    def fetch_range(start: int, end: int) -> None:
+                        # The with block closes the connection even when
+                        # a check below raises, so a rejected response
+                        # does not pin its socket and unread body
+                        with self.session.get(
+                            url,
+                            headers={"Range": f"bytes={start}-{end}"},
+                            stream=True,
+                            timeout=60
+                        ) as response:
+                            response.raise_for_status()
+
+                            # A server or redirect hop that ignores the
+                            # Range header answers 200 with the full
+                            # body; writing that at this offset would
+                            # corrupt the file, so bail out to the
+                            # single-stream path
+                            if response.status_code != 206:
+                                raise ValueError(
+                                    f"Expected 206 for range {start}-{end}, "
+                                    f"got {response.status_code}"
+                                )
+                            content_range = response.headers.get("content-range", "")
+                            if content_range.split("/")[0] != f"bytes {start}-{end}":
+                                raise ValueError(
+                                    f"Content-Range {content_range!r} does not match "
+                                    f"requested range {start}-{end}"
+                                )
+
+                            offset = start
+                            for chunk in response.iter_content(chunk_size=1 << 20):
+                                if chunk:
+                                    os.pwrite(fd, chunk, offset)
+                                    offset += len(chunk)
+                                    pbar.update(len(chunk))
+
+                    with ThreadPoolExecutor(max_workers=parts) as executor:
+                        futures = [
+                            executor.submit(fetch_range, start, end)
+                            for start, end in ranges
+                        ]
+                        for future in futures:
+                            future.result()
+
+            self.logger.info(f"Downloaded {url} in {parts} parallel ranges")
+            return True
+        except Exception as e:
+            self.logger.debug(f"Ranged download of {url} failed, falling back: {str(e)}")
+            return False
+
+    def _make_request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Optional[Dict[str, Any]] = None,
+        stream: bool = False
+    ) -> Optional[Any]:
+        """
+        Make an HTTP request with retry logic.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: URL to request
+            params: Query parameters
+            json_body: JSON request body for POST requests
+            stream: Whether to stream the response
+
+        Returns:
+            Response object (or CachedResponse on cache hit) or None if request failed
+        """
+        # Serve cacheable GETs from the disk-backed response cache
+        cache_key = None
+        conditional_headers = None
+        if self.response_cache is not None and method.upper() == "GET" and not stream:
+            cache_key = ResponseCache.make_key(url, params)
+            cached_body = self.response_cache.get(cache_key)
+            if cached_body is not None:
+                self.logger.debug(f"Response cache hit for {url}")
+                return CachedResponse(cached_body)
+
+            # Stale entry: revalidate with a conditional GET so a 304
+            # skips the payload entirely
+            conditional_headers = self.response_cache.get_validators(cache_key)
+
+        for attempt in range(self.max_retries):
+            try:
+                self._rate_limiter.acquire()
+                with self._request_gate:
+                    response = self.session.request(
+                        method,
+                        url,
+                        params=params,
+                        json=json_body,
+                        headers=conditional_headers,
+                        stream=stream
+                    )
+
+                # 304: the cached body is still valid, serve it and
+                # push its expiry forward
+                if cache_key is not None and response.status_code == 304:
+                    body = self.response_cache.revalidate(cache_key, ttl_for_url(url))
+                    if body is not None:
+                        self.logger.debug(f"Revalidated cached response for {url}")
+                        return CachedResponse(body)
+
+                    # The entry was evicted between get_validators and
+                    # the response; a 304 carries no body to serve or
+                    # cache, so retry unconditionally to get a full 200
+                    self.logger.debug(f"Got 304 for evicted cache entry, refetching {url}")
+                    conditional_headers = None
+                    continue
+
+                response.raise_for_status()
+
+                if cache_key is not None:
+                    self.response_cache.set(
+                        cache_key,
+                        response.text,
+                        ttl_for_url(url),
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified')
+                    )
+
+                return response
+            except requests.RequestException as e:
+                status = getattr(e.response, 'status_code', None)
+
+                # Client errors other than 429 will not succeed on retry
+                if status is not None and 400 <= status < 500 and status != 429:
+                    self.logger.error(f"Request failed with HTTP {status}: {str(e)}")
+                    return None
+
+                self.logger.warning(
+                    f"Request failed (attempt {attempt+1}/{self.max_retries}): {str(e)}"
+                )
+
+                # Check if we should retry
+                if attempt < self.max_retries - 1:
+                    # Exponential backoff with full jitter to avoid
+                    # thundering-herd retries
+                    wait_time = random.uniform(0, self.retry_delay * (2 ** attempt))
+
+                    # When rate limited, honor the server's Retry-After
+                    # and slow the shared token bucket so other threads
+                    # pace down instead of piling on more 429s
+                    if status == 429:
+                        self._rate_limiter.penalize()
+                        retry_after = e.response.headers.get('Retry-After')
+                        if retry_after:
+                            try:
+                                wait_time = float(retry_after)
+                            except ValueError:
+                                pass
+
+                    self.logger.info(f"Waiting {wait_time:.1f}s before retrying...")
+                    time.sleep(wait_time)
+                else:
+                    # Last attempt failed
+                    self.logger.error(f"All {self.max_retries} requests failed: {str(e)}")
+                    return None
+
+        return None  # This should never be reached due to the return in the exception handler
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        if self.response_cache is not None:
+            self.response_cache.save()
+        self.session.close()
@@ -0,0 +1,297 @@
+"""
+Disk-backed cache for provider API responses.
+
+This module provides a small LRU cache for GET responses from the mod
+repository APIs, keyed by URL and query parameters. Search results change
+rarely and get a long TTL; version/file listings change more often and get
+a short one. The cache persists to a JSON file so repeated runs can skip
+most API round-trips entirely.
+"""
+
+import os
+import json
+import atexit
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Any
+
+
+# Cache settings
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "nyxpatcher")
+DEFAULT_CACHE_FILE = "http_cache.json"
+DEFAULT_MAX_ENTRIES = 512
+
+# TTLs by endpoint type (seconds)
+SEARCH_TTL = 7 * 86400  # project-id searches barely change
+VERSION_TTL = 600       # version/file listings change often
+
+# Environment variable that disables response caching entirely
+DISABLE_CACHE_ENV_VAR = "NYXPATCHER_DISABLE_HTTP_CACHE"
+
+
+def ttl_for_url(url: str) -> int:
+    """
+    Pick a TTL for a URL based on how volatile its payload is.
+
+    Args:
+        url: The request URL
+
+    Returns:
+        TTL in seconds
+    """
+    if url.rstrip("/").endswith("/search"):
+        return SEARCH_TTL
+    return VERSION_TTL
+
+
+def caching_disabled() -> bool:
+    """Check whether response caching is disabled via the environment."""
+    return bool(os.environ.get(DISABLE_CACHE_ENV_VAR))
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for requests.Response backed by a cached body.
+
+    Only the parts of the Response interface that the providers use on
+    non-streamed responses are implemented.
+    """
+
+    def __init__(self, body: str):
+        self.text = body
+        self.headers: Dict[str, str] = {}
+        self.status_code = 200
+
+    @property
+    def content(self) -> bytes:
+        return self.text.encode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class ResponseCache:
+    """
+    LRU cache for GET response bodies, persisted to disk as JSON.
+
+    Entries are keyed by a hash of (url, sorted params) and carry their own
+    expiry timestamp so different endpoints can use different TTLs.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        cache_file: str = DEFAULT_CACHE_FILE,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir: Directory to store the cache file in
+            cache_file: Name of the cache file
+            max_entries: Maximum number of entries before LRU eviction
+        """
+        self.cache_path = os.path.join(cache_dir, cache_file)
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._dirty = False
+        self._load()
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build a cache key from a URL and its query parameters.
+
+        Args:
+            url: The request URL
+            params: Query parameters, if any
+
+        Returns:
+            Hex digest key string
+        """
+        if params:
+            encoded = "&".join(f"{k}={params[k]}" for k in sorted(params))
+            raw = f"{url}?{encoded}"
+        else:
+            raw = url
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response body.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached body string or None if missing/expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            # Expired entries are kept around so conditional GETs can
+            # revalidate them, but are not served as fresh
+            if datetime.now().timestamp() > entry.get("expires_at", 0):
+                return None
+
+            # Mark as most recently used
+            self._entries.move_to_end(key)
+            return entry.get("body")
+
+    def get_validators(self, key: str) -> Optional[Dict[str, str]]:
+        """
+        Get conditional request headers for a stale cache entry.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Dictionary with If-None-Match/If-Modified-Since headers, or
+            None if there is no entry or it carries no validators
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            headers = {}
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            return headers or None
+
+    def revalidate(self, key: str, ttl: int) -> Optional[str]:
+        """
+        Mark a stale entry fresh again after a 304 response.
+
+        Args:
+            key: Cache key from make_key()
+            ttl: New time to live in seconds
+
+        Returns:
+            The cached body, or None if the entry disappeared
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            entry["expires_at"] = datetime.now().timestamp() + ttl
+            self._entries.move_to_end(key)
+            self._dirty = True
+            return entry.get("body")
+
+    def set(
+        self,
+        key: str,
+        body: str,
+        ttl: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """
+        Store a response body in the cache.
+
+        Args:
+            key: Cache key from make_key()
+            body: Response body text
+            ttl: Time to live in seconds
+            etag: ETag response header, if the server sent one
+            last_modified: Last-Modified response header, if sent
+        """
+        with self._lock:
+            self._entries[key] = {
+                "body": body,
+                "expires_at": datetime.now().timestamp() + ttl,
+                "etag": etag,
+                "last_modified": last_modified
+            }
+            self._entries.move_to_end(key)
+
+            # Evict least recently used entries beyond the size cap
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            self._dirty = True
+
+    def save(self) -> bool:
+        """
+        Persist the cache to disk if it has changed.
+
+        Returns:
+            True if saved (or nothing to save), False on error
+        """
+        with self._lock:
+            if not self._dirty:
+                return True
+
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+
+                temp_path = f"{self.cache_path}.tmp"
+                with open(temp_path, 'w') as f:
+                    json.dump(dict(self._entries), f)
+                os.replace(temp_path, self.cache_path)
+
+                self._dirty = False
+                return True
+            except (IOError, OSError) as e:
+                self.logger.warning(f"Error saving response cache: {str(e)}")
+                return False
+
+    def _load(self) -> None:
+        """Load cached entries from disk, dropping any that have expired."""
+        try:
+            if not os.path.exists(self.cache_path):
+                return
+
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+
+            now = datetime.now().timestamp()
+            for key, entry in data.items():
+                if not isinstance(entry, dict):
+                    continue
+                # Keep stale entries that can still be revalidated cheaply
+                fresh = now <= entry.get("expires_at", 0)
+                if fresh or entry.get("etag") or entry.get("last_modified"):
+                    self._entries[key] = entry
+        except (json.JSONDecodeError, IOError, OSError) as e:
+            self.logger.warning(f"Error loading response cache: {str(e)}")
+            self._entries = OrderedDict()
+
+
+# Shared cache instance so both providers hit the same file
+_shared_cache: Optional[ResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the shared response cache instance.
+
+    Returns:
+        The shared ResponseCache, or None if caching is disabled
+    """
+    global _shared_cache
+
+    if caching_disabled():
+        return None
+
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+            atexit.register(_shared_cache.save)
+        return _shared_cache
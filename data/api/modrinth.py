@@ -1,239 +1,246 @@
-"""
-Modrinth API provider implementation.
-"""
-
-import json
-import logging
-import requests
-import time
-from typing import Dict, List, Optional, Any, Tuple
-from pathlib import Path
-
-from tqdm import tqdm
-
-from data.api.base import BaseProvider
-
-# Modrinth API constants
-MODRINTH_API_BASE = "https://api.modrinth.com/v2"
-MODRINTH_USER_AGENT = "minecraft-mod-updater/1.0"
-
-
-class ModrinthProvider(BaseProvider):
-    """Provider for interacting with the Modrinth API."""
-    
-    def __init__(self):
-        """Initialize the Modrinth provider."""
-        self.headers = {
-            "User-Agent": MODRINTH_USER_AGENT
-        }
-        self.max_retries = 3
-        self.retry_delay = 1  # seconds
-        self.logger = logging.getLogger(__name__)
-        
-    def get_project_id(self, mod_id: str) -> Optional[str]:
-        """
-        Get the Modrinth project ID for a mod.
-        
-        Args:
-            mod_id: The mod ID to look up
-            
-        Returns:
-            Modrinth project ID or None if not found
-        """
-        try:
-            url = f"{MODRINTH_API_BASE}/search"
-            params = {
-                "query": mod_id,
-                "facets": json.dumps([["project_type:mod"]]),
-                "limit": 5
-            }
-            
-            response = self._make_request("GET", url, params=params)
-            if not response:
-                return None
-                
-            data = response.json()
-            hits = data.get('hits', [])
-            
-            # Try to find an exact match first
-            for hit in hits:
-                if hit.get('slug') == mod_id or hit.get('title').lower() == mod_id.lower():
-                    self.logger.info(f"Found exact match for mod {mod_id} on Modrinth: {hit.get('project_id')}")
-                    return hit.get('project_id')
-            
-            # If no exact match, use the first result if available
-            if hits:
-                self.logger.info(f"Using best match for mod {mod_id} on Modrinth: {hits[0].get('project_id')}")
-                return hits[0].get('project_id')
-            
-            self.logger.warning(f"No results found for mod {mod_id} on Modrinth")
-            return None
-        except Exception as e:
-            self.logger.error(f"Error searching for mod {mod_id} on Modrinth: {str(e)}")
-            return None
-    
-    def get_latest_version(
-        self, 
-        project_id: str, 
-        game_version: str, 
-        mod_loader: str
-    ) -> Optional[Dict[str, Any]]:
-        """
-        Get the latest version of a mod from Modrinth.
-        
-        Args:
-            project_id: Modrinth project ID
-            game_version: Minecraft game version to filter by
-            mod_loader: Mod loader to filter by (fabric, forge, quilt)
-            
-        Returns:
-            Dictionary containing version info or None if not found
-        """
-        try:
-            url = f"{MODRINTH_API_BASE}/project/{project_id}/version"
-            params = {
-                "game_versions": f"[\"{game_version}\"]",
-                "loaders": f"[\"{mod_loader}\"]"
-            }
-            
-            response = self._make_request("GET", url, params=params)
-            if not response:
-                return None
-                
-            versions = response.json()
-            if not versions:
-                self.logger.warning(f"No versions found for Modrinth project {project_id}")
-                return None
-                
-            # Strictly filter for versions matching our loader and game version
-            filtered_versions = [
-                v for v in versions 
-                if mod_loader in v.get('loaders', []) 
-                and game_version in v.get('game_versions', [])
-            ]
-            
-            if filtered_versions:
-                # Add the provider name to the version info
-                version_info = filtered_versions[0]
-                version_info['provider'] = 'modrinth'
-                self.logger.info(f"Found latest version for Modrinth project {project_id}: {version_info.get('version_number')}")
-                return version_info
-            
-            # If no match found, log it and return None
-            self.logger.warning(
-                f"No {mod_loader} version found for Modrinth project {project_id} "
-                f"compatible with Minecraft {game_version}"
-            )
-            return None
-        except Exception as e:
-            self.logger.error(f"Error getting versions for Modrinth project {project_id}: {str(e)}")
-            return None
-    
-    def download_mod(
-        self, 
-        version_info: Dict[str, Any], 
-        output_path: str
-    ) -> bool:
-        """
-        Download a mod version to the specified path.
-        
-        Args:
-            version_info: Version information dictionary from get_latest_version
-            output_path: Path where the file should be saved
-            
-        Returns:
-            True if download was successful, False otherwise
-        """
-        try:
-            # Get download URL from version info
-            files = version_info.get('files', [])
-            if not files:
-                self.logger.warning("No download files available in version info")
-                return False
-                
-            # Use the primary file (first in the list)
-            download_url = files[0].get('url')
-            if not download_url:
-                self.logger.warning("No download URL available in version info")
-                return False
-            
-            # Download the file
-            response = self._make_request("GET", download_url, stream=True)
-            if not response:
-                return False
-                
-            # Get file size for progress bar
-            total_size = int(response.headers.get('content-length', 0))
-            
-            # Ensure directory exists
-            output_dir = Path(output_path).parent
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Download with progress bar
-            with open(output_path, 'wb') as f:
-                with tqdm(
-                    total=total_size,
-                    unit='B',
-                    unit_scale=True,
-                    desc=Path(output_path).name,
-                    leave=False
-                ) as pbar:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            pbar.update(len(chunk))
-            
-            self.logger.info(f"Successfully downloaded mod to {output_path}")
-            return True
-        except Exception as e:
-            self.logger.error(f"Error downloading mod: {str(e)}")
-            return False
-    
-    def _make_request(
-        self, 
-        method: str, 
-        url: str, 
-        params: Optional[Dict[str, Any]] = None, 
-        stream: bool = False
-    ) -> Optional[requests.Response]:
-        """
-        Make an HTTP request with retry logic.
-        
-        Args:
-            method: HTTP method (GET, POST, etc.)
-            url: URL to request
-            params: Query parameters
-            stream: Whether to stream the response
-            
-        Returns:
-            Response object or None if request failed
-        """
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.request(
-                    method, 
-                    url, 
-                    params=params, 
-                    headers=self.headers,
-                    stream=stream
-                )
-                response.raise_for_status()
-                return response
-            except requests.RequestException as e:
-                self.logger.warning(
-                    f"Request failed (attempt {attempt+1}/{self.max_retries}): {str(e)}"
-                )
-                
-                # Check if we should retry
-                if attempt < self.max_retries - 1:
-                    # Implement exponential backoff
-                    wait_time = self.retry_delay * (2 ** attempt)
-                    self.logger.info(f"Waiting {wait_time}s before retrying...")
-                    time.sleep(wait_time)
-                else:
-                    # Last attempt failed
-                    self.logger.error(f"All {self.max_retries} requests failed: {str(e)}")
-                    return None
-        
-        return None  # This should never be reached due to the return in the exception handler
-
+"""
+Modrinth API provider implementation.
+"""
+
+import json
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
+
+from data.api.base import BaseProvider, parse_json
+
+# Modrinth API constants
+MODRINTH_API_BASE = "https://api.modrinth.com/v2"
+MODRINTH_USER_AGENT = "minecraft-mod-updater/1.0"
+
+# Modrinth allows roughly 300 requests per minute
+MODRINTH_REQUESTS_PER_SECOND = 300 / 60
+
+# Maximum number of file hashes per batched POST /version_files request
+BULK_HASH_LOOKUP_SIZE = 100
+
+# The facets filter never changes, so encode it once at import
+_MOD_FACETS = json.dumps([["project_type:mod"]])
+
+
+@lru_cache(maxsize=64)
+def _encode_filters(game_version: str, mod_loader: str) -> Tuple[str, str]:
+    """
+    Encode game version and loader as the JSON array strings the
+    version-listing endpoint expects.
+
+    Args:
+        game_version: Minecraft game version
+        mod_loader: Mod loader name
+
+    Returns:
+        Tuple of (game_versions param, loaders param)
+    """
+    return f'["{game_version}"]', f'["{mod_loader}"]'
+
+
+class ModrinthProvider(BaseProvider):
+    """Provider for interacting with the Modrinth API."""
+
+    def __init__(self):
+        """Initialize the Modrinth provider."""
+        super().__init__(
+            headers={"User-Agent": MODRINTH_USER_AGENT},
+            max_requests_per_second=MODRINTH_REQUESTS_PER_SECOND
+        )
+        self._start_connection_warmup(MODRINTH_API_BASE)
+
+    def get_project_id(self, mod_id: str) -> Optional[str]:
+        """
+        Get the Modrinth project ID for a mod.
+
+        Args:
+            mod_id: The mod ID to look up
+
+        Returns:
+            Modrinth project ID or None if not found
+        """
+        # Repeated lookups for the same mod ID are answered from memory
+        if mod_id in self._project_id_cache:
+            return self._project_id_cache[mod_id]
+
+        project_id = self._lookup_project_id(mod_id)
+        self._project_id_cache[mod_id] = project_id
+        return project_id
+
+    def get_project_ids_by_hashes(self, hashes: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve project IDs for many mod files in one round-trip.
+
+        The version_files endpoint maps SHA-1 hashes straight to the
+        versions they belong to, so a whole directory of unresolved mods
+        costs one request per BULK_HASH_LOOKUP_SIZE chunk instead of one
+        search per mod.
+
+        Args:
+            hashes: SHA-1 hashes of the mod files to look up
+
+        Returns:
+            Dictionary mapping each hash to its project ID (or None)
+        """
+        results: Dict[str, Optional[str]] = {file_hash: None for file_hash in hashes}
+
+        for start in range(0, len(hashes), BULK_HASH_LOOKUP_SIZE):
+            chunk = hashes[start:start + BULK_HASH_LOOKUP_SIZE]
+
+            try:
+                url = f"{MODRINTH_API_BASE}/version_files"
+                response = self._make_request(
+                    "POST", url, json_body={"hashes": chunk, "algorithm": "sha1"}
+                )
+                if not response:
+                    continue
+
+                data = parse_json(response)
+                for file_hash, version in data.items():
+                    project_id = version.get('project_id')
+                    if project_id:
+                        results[file_hash] = project_id
+            except Exception as e:
+                self.logger.error(f"Error batch-resolving hashes on Modrinth: {str(e)}")
+
+        found = sum(1 for project_id in results.values() if project_id)
+        self.logger.info(f"Resolved {found}/{len(hashes)} mod hashes on Modrinth")
+        return results
+
+    def get_latest_versions_by_hashes(
+        self,
+        hashes: List[str],
+        game_version: str,
+        mod_loader: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve the latest matching version for many mod files at once.
+
+        The version_files/update endpoint takes file hashes plus loader
+        and game-version filters and returns the newest compatible
+        version per hash, collapsing one versions query per mod into one
+        request per BULK_HASH_LOOKUP_SIZE chunk.
+
+        Args:
+            hashes: SHA-1 hashes of the installed mod files
+            game_version: Minecraft game version to filter by
+            mod_loader: Mod loader to filter by (fabric, forge, quilt)
+
+        Returns:
+            Dictionary mapping each hash that resolved to its latest
+            version info; hashes with no compatible version are omitted
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+
+        for start in range(0, len(hashes), BULK_HASH_LOOKUP_SIZE):
+            chunk = hashes[start:start + BULK_HASH_LOOKUP_SIZE]
+
+            try:
+                url = f"{MODRINTH_API_BASE}/version_files/update"
+                response = self._make_request(
+                    "POST", url, json_body={
+                        "hashes": chunk,
+                        "algorithm": "sha1",
+                        "loaders": [mod_loader],
+                        "game_versions": [game_version]
+                    }
+                )
+                if not response:
+                    continue
+
+                data = parse_json(response)
+                for file_hash, version_info in data.items():
+                    if version_info:
+                        version_info['provider'] = 'modrinth'
+                        results[file_hash] = version_info
+            except Exception as e:
+                self.logger.error(f"Error batch-fetching latest versions from Modrinth: {str(e)}")
+
+        self.logger.info(f"Resolved latest versions for {len(results)}/{len(hashes)} mod hashes on Modrinth")
+        return results
+
+    def _lookup_project_id(self, mod_id: str) -> Optional[str]:
+        """
+        Search Modrinth for a mod's project ID.
+
+        Args:
+            mod_id: The mod ID to look up
+
+        Returns:
+            Modrinth project ID or None if not found
+        """
+        try:
+            url = f"{MODRINTH_API_BASE}/search"
+            params = {
+                "query": mod_id,
+                "facets": _MOD_FACETS,
+                "limit": 5
+            }
+
+            response = self._make_request("GET", url, params=params)
+            if not response:
+                return None
+
+            data = parse_json(response)
+            hits = data.get('hits', [])
+
+            # Try to find an exact match first
+            for hit in hits:
+                if hit.get('slug') == mod_id or hit.get('title').lower() == mod_id.lower():
+                    self.logger.info(f"Found exact match for mod {mod_id} on Modrinth: {hit.get('project_id')}")
+                    return hit.get('project_id')
+
+            # If no exact match, use the first result if available
+            if hits:
+                self.logger.info(f"Using best match for mod {mod_id} on Modrinth: {hits[0].get('project_id')}")
+                return hits[0].get('project_id')
+
+            self.logger.warning(f"No results found for mod {mod_id} on Modrinth")
+            return None
+        except Exception as e:
+            self.logger.error(f"Error searching for mod {mod_id} on Modrinth: {str(e)}")
+            return None
+
+    def get_latest_version(
+        self,
+        project_id: str,
+        game_version: str,
+        mod_loader: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest version of a mod from Modrinth.
+
+        Args:
+            project_id: Modrinth project ID
+            game_version: Minecraft game version to filter by
+            mod_loader: Mod loader to filter by (fabric, forge, quilt)
+
+        Returns:
+            Dictionary containing version info or None if not found
+        """
+        try:
+            url = f"{MODRINTH_API_BASE}/project/{project_id}/version"
+            game_versions_param, loaders_param = _encode_filters(game_version, mod_loader)
+            params = {
+                "game_versions": game_versions_param,
+                "loaders": loaders_param
+            }
+
+            response = self._make_request("GET", url, params=params)
+            if not response:
+                return None
+
+            versions = parse_json(response)
+            if not versions:
+                self.logger.warning(f"No versions found for Modrinth project {project_id}")
+                return None
+
+            # The API already filtered by loader and game version through
+            # the query parameters, so the first entry is the latest match
+            version_info = versions[0]
+            version_info['provider'] = 'modrinth'
+            self.logger.info(f"Found latest version for Modrinth project {project_id}: {version_info.get('version_number')}")
+            return version_info
+        except Exception as e:
+            self.logger.error(f"Error getting versions for Modrinth project {project_id}: {str(e)}")
+            return None
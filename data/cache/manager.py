@@ -1,336 +1,1060 @@
-"""
-Cache management for mod update checker.
-
-This module provides cache functionality to store and retrieve information about mods,
-their versions, and download history to reduce API calls and improve performance.
-"""
-
-import os
-import json
-import logging
-from typing import Dict, Optional, Any, Set
-from datetime import datetime
-from pathlib import Path
-
-
-# Default cache settings
-DEFAULT_CACHE_FILE = "mod_cache.json"
-DEFAULT_CACHE_EXPIRY_HOURS = 168  # 7 days (1 week)
-
-
-class ModCache:
-    """
-    Class for managing mod cache data and operations.
-    
-    This class handles storing and retrieving information about mods, including
-    file metadata, project IDs, latest versions, and download history.
-    """
-    
-    def __init__(
-        self,
-        cache_file: str = DEFAULT_CACHE_FILE,
-        last_scan: Optional[str] = None,
-        mod_files: Dict[str, Dict[str, Any]] = None,
-        project_ids: Dict[str, Dict[str, Any]] = None,
-        latest_versions: Dict[str, Dict[str, Any]] = None,
-        downloaded_files: Dict[str, Dict[str, Any]] = None
-    ):
-        """
-        Initialize the ModCache instance.
-        
-        Args:
-            cache_file: Path to the cache file
-            last_scan: ISO formatted datetime string of the last scan
-            mod_files: Dictionary of mod file metadata
-            project_ids: Dictionary of project IDs by provider
-            latest_versions: Dictionary of latest version info
-            downloaded_files: Dictionary of downloaded file info
-        """
-        self.cache_file = cache_file
-        self.last_scan = last_scan
-        self.mod_files = mod_files or {}
-        self.project_ids = project_ids or {}
-        self.latest_versions = latest_versions or {}
-        self.downloaded_files = downloaded_files or {}
-        self.logger = logging.getLogger(__name__)
-    
-    @classmethod
-    def load(cls, cache_file: str = DEFAULT_CACHE_FILE) -> 'ModCache':
-        """
-        Load cache from file or return a new empty cache.
-        
-        Args:
-            cache_file: Path to the cache file
-            
-        Returns:
-            ModCache instance with loaded data or defaults
-        """
-        try:
-            if os.path.exists(cache_file):
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                    logging.info(f"Loaded cache from {cache_file}")
-                    
-                    return cls(
-                        cache_file=cache_file,
-                        last_scan=data.get("last_scan"),
-                        mod_files=data.get("mod_files", {}),
-                        project_ids=data.get("project_ids", {}),
-                        latest_versions=data.get("latest_versions", {}),
-                        downloaded_files=data.get("downloaded_files", {})
-                    )
-        except (json.JSONDecodeError, IOError) as e:
-            logging.warning(f"Error loading cache: {str(e)}")
-            
-            # If the file is corrupted, try to create a backup
-            if os.path.exists(cache_file):
-                backup_file = f"{cache_file}.bak"
-                try:
-                    os.rename(cache_file, backup_file)
-                    logging.warning(f"Corrupted cache file renamed to {backup_file}")
-                except OSError:
-                    logging.error(f"Failed to create backup of corrupted cache file")
-        
-        # Return new cache if loading failed
-        return cls(cache_file=cache_file)
-    
-    def save(self) -> bool:
-        """
-        Save cache to file.
-        
-        Returns:
-            True if save was successful, False otherwise
-        """
-        try:
-            # Update last scan timestamp
-            self.last_scan = datetime.now().isoformat()
-            
-            # Prepare data for serialization
-            data = {
-                "last_scan": self.last_scan,
-                "mod_files": self.mod_files,
-                "project_ids": self.project_ids,
-                "latest_versions": self.latest_versions,
-                "downloaded_files": self.downloaded_files
-            }
-            
-            # Write to a temporary file first for atomic operation
-            temp_file = f"{self.cache_file}.tmp"
-            with open(temp_file, 'w') as f:
-                json.dump(data, f, indent=4)
-            
-            # Replace the original file with the temp file
-            if os.path.exists(self.cache_file):
-                os.replace(temp_file, self.cache_file)
-            else:
-                os.rename(temp_file, self.cache_file)
-                
-            self.logger.info(f"Cache saved to {self.cache_file}")
-            return True
-        except IOError as e:
-            self.logger.error(f"Error saving cache: {str(e)}")
-            return False
-    
-    def is_expired(self, expiry_hours: int = DEFAULT_CACHE_EXPIRY_HOURS) -> bool:
-        """
-        Check if the cache has expired.
-        
-        Args:
-            expiry_hours: Number of hours after which cache is considered expired
-            
-        Returns:
-            True if the cache has expired, False otherwise
-        """
-        if not self.last_scan:
-            return True
-            
-        try:
-            last_scan = datetime.fromisoformat(self.last_scan)
-            now = datetime.now()
-            
-            # Check if cache has expired
-            time_difference = now - last_scan
-            if time_difference.total_seconds() > (expiry_hours * 3600):
-                self.logger.info(f"Cache expired (age: {time_difference.total_seconds() / 3600:.1f} hours)")
-                return True
-                
-            return False
-        except (ValueError, TypeError):
-            self.logger.warning("Invalid last_scan timestamp, considering cache expired")
-            return True
-    
-    def get_project_ids(self, mod_id: str) -> Dict[str, Optional[str]]:
-        """
-        Get cached project IDs for a mod.
-        
-        Args:
-            mod_id: The mod ID to lookup
-            
-        Returns:
-            Dictionary containing provider project IDs or None
-        """
-        if mod_id in self.project_ids:
-            return self.project_ids[mod_id]
-        return {"modrinth": None, "curseforge": None}
-    
-    def set_project_ids(self, mod_id: str, modrinth_id: Optional[str] = None, curseforge_id: Optional[str] = None) -> None:
-        """
-        Store project IDs for a mod in the cache.
-        
-        Args:
-            mod_id: The mod ID
-            modrinth_id: Modrinth project ID
-            curseforge_id: CurseForge project ID
-        """
-        if mod_id not in self.project_ids:
-            self.project_ids[mod_id] = {}
-            
-        # Only update if the value is not None
-        if modrinth_id is not None:
-            self.project_ids[mod_id]["modrinth"] = modrinth_id
-        if curseforge_id is not None:
-            self.project_ids[mod_id]["curseforge"] = curseforge_id
-    
-    def get_mod_file_info(self, file_path: str) -> Optional[Dict[str, Any]]:
-        """
-        Get cached information about a mod file.
-        
-        Args:
-            file_path: Absolute path to the mod file
-            
-        Returns:
-            Dictionary containing file info or None if not in cache
-        """
-        return self.mod_files.get(file_path)
-    
-    def set_mod_file_info(self, file_path: str, info: Dict[str, Any]) -> None:
-        """
-        Store information about a mod file in the cache.
-        
-        Args:
-            file_path: Absolute path to the mod file
-            info: Dictionary containing file information
-        """
-        self.mod_files[file_path] = info
-    
-    def remove_mod_file(self, file_path: str) -> None:
-        """
-        Remove a mod file from the cache.
-        
-        Args:
-            file_path: Absolute path to the mod file
-        """
-        if file_path in self.mod_files:
-            del self.mod_files[file_path]
-    
-    def get_version_info(self, provider: str, project_id: str, game_version: str, mod_loader: str) -> Optional[Dict[str, Any]]:
-        """
-        Get cached version information for a mod.
-        
-        Args:
-            provider: Provider name ('modrinth' or 'curseforge')
-            project_id: Provider-specific project ID
-            game_version: Minecraft version
-            mod_loader: Mod loader type
-            
-        Returns:
-            Dictionary containing version info or None if not in cache
-        """
-        cache_key = f"{provider}:{project_id}:{game_version}:{mod_loader}"
-        return self.latest_versions.get(cache_key)
-    
-    def set_version_info(self, provider: str, project_id: str, game_version: str, mod_loader: str, version_info: Dict[str, Any]) -> None:
-        """
-        Store version information for a mod in the cache.
-        
-        Args:
-            provider: Provider name ('modrinth' or 'curseforge')
-            project_id: Provider-specific project ID
-            game_version: Minecraft version
-            mod_loader: Mod loader type
-            version_info: Dictionary containing version information
-        """
-        cache_key = f"{provider}:{project_id}:{game_version}:{mod_loader}"
-        self.latest_versions[cache_key] = version_info
-    
-    def get_download_info(self, mod_name: str, version: str) -> Optional[Dict[str, Any]]:
-        """
-        Get cached download information for a mod version.
-        
-        Args:
-            mod_name: Name of the mod
-            version: Version of the mod
-            
-        Returns:
-            Dictionary containing download info or None if not in cache
-        """
-        cache_key = f"{mod_name}:{version}"
-        return self.downloaded_files.get(cache_key)
-    
-    def set_download_info(self, mod_name: str, version: str, download_info: Dict[str, Any]) -> None:
-        """
-        Store download information for a mod version in the cache.
-        
-        Args:
-            mod_name: Name of the mod
-            version: Version of the mod
-            download_info: Dictionary containing download information
-        """
-        cache_key = f"{mod_name}:{version}"
-        self.downloaded_files[cache_key] = download_info
-    
-    def clean_up(self, processed_files: Optional[Set[str]] = None) -> None:
-        """
-        Clean up the cache by removing entries for files that no longer exist.
-        
-        Args:
-            processed_files: Set of file paths that were processed in the current run
-        """
-        if processed_files:
-            for file_path in list(self.mod_files.keys()):
-                if file_path not in processed_files:
-                    self.logger.info(f"Removing deleted file from cache: {file_path}")
-                    self.remove_mod_file(file_path)
-                    
-    def prune_old_versions(self, max_age_days: int = 30) -> int:
-        """
-        Remove version information older than the specified age.
-        
-        Args:
-            max_age_days: Maximum age in days for version information
-            
-        Returns:
-            Number of pruned entries
-        """
-        if not self.latest_versions:
-            return 0
-            
-        now = datetime.now()
-        max_age_seconds = max_age_days * 24 * 3600
-        pruned_count = 0
-        
-        for key in list(self.latest_versions.keys()):
-            version_info = self.latest_versions[key]
-            date_str = version_info.get('date_published')
-            
-            if not date_str:
-                continue
-                
-            try:
-                # Handle ISO format with Z for UTC
-                if date_str.endswith('Z'):
-                    date_str = date_str[:-1] + '+00:00'
-                    
-                pub_date = datetime.fromisoformat(date_str)
-                age = now - pub_date
-                
-                if age.total_seconds() > max_age_seconds:
-                    del self.latest_versions[key]
-                    pruned_count += 1
-            except (ValueError, TypeError):
-                self.logger.warning(f"Invalid date format: {date_str}")
-        
-        if pruned_count > 0:
-            self.logger.info(f"Pruned {pruned_count} old version entries from cache")
-            
-        return pruned_count
+"""
+Cache management for mod update checker.
+
+This module provides cache functionality to store and retrieve information about mods,
+their versions, and download history to reduce API calls and improve performance.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Any, Set
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# orjson serializes and parses dict-heavy payloads several times faster
+# than the stdlib; fall back to json if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson streams large cache files section by section instead of
+# materializing the whole document, keeping peak memory flat
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# msgpack is a binary format that encodes faster and smaller than JSON;
+# the cache is internal and never read by hand, so it is preferred when
+# installed. Old JSON caches are still readable and migrate on save.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Header identifying a msgpack-encoded cache file
+_MSGPACK_MAGIC = b'MPK1'
+
+# Top-level sections of the cache file
+_CACHE_SECTIONS = ("last_scan", "mod_files", "project_ids", "latest_versions", "downloaded_files")
+
+# Sections kept in the JSON/msgpack blob; mod_files lives in SQLite and
+# must not be pre-filled from a (possibly emptied) legacy blob section
+_BLOB_SECTIONS = ("project_ids", "latest_versions", "downloaded_files")
+
+
+def _loads_cache(raw: bytes) -> Any:
+    """
+    Decode a cache file body.
+
+    Args:
+        raw: Raw file contents
+
+    Returns:
+        Decoded JSON data
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps_cache(data: Any) -> bytes:
+    """
+    Encode cache data for writing to disk.
+
+    Args:
+        data: Cache data dictionary
+
+    Returns:
+        Encoded JSON bytes
+    """
+    # The cache is not meant for human editing, so skip pretty-printing:
+    # compact separators roughly halve stdlib encode time and
+    # ensure_ascii=False avoids per-character escaping of Unicode names
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+
+
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts a trailing 'Z' natively on 3.11+, so the
+    # per-call slice-and-concat rewrite is only needed on older runtimes
+    _parse_iso = lru_cache(maxsize=8192)(datetime.fromisoformat)
+else:
+    @lru_cache(maxsize=8192)
+    def _parse_iso(date_str: str) -> datetime:
+        """
+        Parse an ISO 8601 timestamp, memoizing repeated values.
+
+        Many cached versions share identical publish dates, so caching
+        the parse avoids re-running fromisoformat over the same strings.
+
+        Args:
+            date_str: ISO formatted datetime string ('Z' suffix accepted)
+
+        Returns:
+            Parsed datetime
+        """
+        # Handle ISO format with Z for UTC
+        if date_str.endswith('Z'):
+            date_str = date_str[:-1] + '+00:00'
+        return datetime.fromisoformat(date_str)
+
+
+@lru_cache(maxsize=8192)
+def _parse_iso_ts(date_str: str) -> float:
+    """
+    Parse an ISO 8601 timestamp into a POSIX float, memoized.
+
+    Float comparisons skip the datetime/timedelta allocations that
+    object-level arithmetic would incur per entry on hot loops.
+
+    Args:
+        date_str: ISO formatted datetime string ('Z' suffix accepted)
+
+    Returns:
+        Seconds since the epoch
+    """
+    return _parse_iso(date_str).timestamp()
+
+
+# Minimum section size before the string-dedup pass is worth running
+_DEDUPE_MIN_ENTRIES = 64
+
+
+def _dedupe_strings(obj: Any, pool: Dict[str, str]) -> Any:
+    """
+    Collapse duplicate strings in parsed cache data to shared objects.
+
+    JSON parsing produces a distinct str object per occurrence even
+    though cached entries repeat the same game versions, loader names
+    and URL prefixes thousands of times; canonicalizing through a local
+    pool substantially shrinks the resident heap for large caches.
+
+    Args:
+        obj: Parsed value to walk
+        pool: Canonical string pool, shared across the pass
+
+    Returns:
+        Value with duplicate strings replaced by pooled objects
+    """
+    if isinstance(obj, str):
+        return pool.setdefault(obj, obj)
+    if isinstance(obj, dict):
+        return {
+            pool.setdefault(k, k) if isinstance(k, str) else k: _dedupe_strings(v, pool)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_dedupe_strings(v, pool) for v in obj]
+    return obj
+
+
+# Marks a field a row never had, as opposed to one stored as None;
+# the NUL bytes keep it from colliding with real cached strings
+_ABSENT_FIELD = "\x00absent\x00"
+
+
+def _encode_mod_files(mod_files: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Encode mod file info in a columnar (struct-of-arrays) layout.
+
+    Per-entry dicts repeat the same field names thousands of times on
+    disk; storing the field list once and the values as rows cuts both
+    file size and the per-entry dict allocations on load.
+
+    Args:
+        mod_files: Mapping of path to file info dict
+
+    Returns:
+        Columnar representation with paths, fields and rows
+    """
+    fields: list = []
+    seen = set()
+    for info in mod_files.values():
+        for field in info:
+            if field not in seen:
+                seen.add(field)
+                fields.append(field)
+
+    return {
+        "paths": list(mod_files),
+        "fields": fields,
+        "rows": [
+            [info.get(f, _ABSENT_FIELD) for f in fields]
+            for info in mod_files.values()
+        ]
+    }
+
+
+def _decode_mod_files(value: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Decode mod file info from either columnar or plain mapping form.
+
+    Args:
+        value: Section contents as loaded from disk
+
+    Returns:
+        Mapping of path to file info dict
+    """
+    if "fields" in value and "rows" in value:
+        # Only padding for fields a row never had is dropped; a stored
+        # None survives the round-trip so callers subscripting the entry
+        # (e.g. mod_metadata["mod_id"]) see the value they saved
+        fields = value["fields"]
+        return {
+            path: {f: v for f, v in zip(fields, row) if v != _ABSENT_FIELD}
+            for path, row in zip(value["paths"], value["rows"])
+        }
+    # Legacy per-entry dict layout
+    return value
+
+
+# Default cache settings
+DEFAULT_CACHE_FILE = "mod_cache.json"
+DEFAULT_CACHE_EXPIRY_HOURS = 168  # 7 days (1 week)
+
+# Bounds for the adaptive per-entry version info TTL
+MIN_VERSION_TTL_SECONDS = 3600          # actively updated mods
+MAX_VERSION_TTL_SECONDS = 7 * 86400     # dormant mods
+
+# How long a whole-run update result set stays reusable; kept short
+# because it bypasses every per-mod freshness check
+UPDATE_RESULTS_TTL_SECONDS = 3600
+
+
+def _adaptive_ttl(date_published: Optional[str]) -> float:
+    """
+    Pick a TTL for a version entry based on how old its release is.
+
+    A mod that released recently is likely to release again soon, so its
+    cached "latest version" goes stale quickly; one untouched for years
+    can be trusted for much longer.
+
+    Args:
+        date_published: ISO publish timestamp of the cached version
+
+    Returns:
+        TTL in seconds, clamped between the min and max bounds
+    """
+    if date_published:
+        try:
+            age = time.time() - _parse_iso_ts(date_published)
+            return min(MAX_VERSION_TTL_SECONDS, max(MIN_VERSION_TTL_SECONDS, 0.1 * age))
+        except (ValueError, TypeError):
+            pass
+    return MIN_VERSION_TTL_SECONDS
+
+
+class ModCache:
+    """
+    Class for managing mod cache data and operations.
+    
+    This class handles storing and retrieving information about mods, including
+    file metadata, project IDs, latest versions, and download history.
+    """
+
+    # Fixed attribute layout: skips the per-instance __dict__ and makes
+    # attribute access an index load on the hot cache-operation paths
+    __slots__ = (
+        "cache_file", "last_scan", "logger",
+        "_lazy_path", "_db", "_db_error", "_db_lock", "_dirty",
+        "_sections", "_update_results"
+    )
+
+    def __init__(
+        self,
+        cache_file: str = DEFAULT_CACHE_FILE,
+        last_scan: Optional[str] = None,
+        mod_files: Dict[str, Dict[str, Any]] = None,
+        project_ids: Dict[str, Dict[str, Any]] = None,
+        latest_versions: Dict[str, Dict[str, Any]] = None,
+        downloaded_files: Dict[str, Dict[str, Any]] = None
+    ):
+        """
+        Initialize the ModCache instance.
+        
+        Args:
+            cache_file: Path to the cache file
+            last_scan: ISO formatted datetime string of the last scan
+            mod_files: Dictionary of mod file metadata
+            project_ids: Dictionary of project IDs by provider
+            latest_versions: Dictionary of latest version info
+            downloaded_files: Dictionary of downloaded file info
+        """
+        self.cache_file = cache_file
+        self.last_scan = last_scan
+        self.logger = logging.getLogger(__name__)
+
+        # Path to read unloaded sections from, set by load()
+        self._lazy_path: Optional[str] = None
+
+        # SQLite backing store for mod_files; opened on first use. The
+        # connection is shared across the checker's worker threads, so
+        # the lock serializes every statement against it
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_error = False
+        self._db_lock = threading.Lock()
+
+        # Sections mutated since the last save; clean shards are skipped
+        self._dirty: Set[str] = set()
+
+        # Whole-run update results keyed by a configuration signature;
+        # lives in the main cache file because it is a single small record
+        self._update_results: Optional[Dict[str, Any]] = None
+
+        # Sections parsed so far; missing ones are read on first access.
+        # Passing the dicts through dict() presizes the copies for their
+        # current length, so follow-up inserts start from a compact table
+        # instead of growing through repeated rehashes
+        self._sections: Dict[str, Dict[str, Any]] = {}
+        if mod_files is not None:
+            self._sections["mod_files"] = dict(mod_files)
+            self._dirty.add("mod_files")
+        if project_ids is not None:
+            self._sections["project_ids"] = dict(project_ids)
+            self._dirty.add("project_ids")
+        if latest_versions is not None:
+            self._sections["latest_versions"] = dict(latest_versions)
+            self._dirty.add("latest_versions")
+        if downloaded_files is not None:
+            self._sections["downloaded_files"] = dict(downloaded_files)
+            self._dirty.add("downloaded_files")
+
+    @property
+    def mod_files(self) -> Dict[str, Any]:
+        if "mod_files" not in self._sections:
+            self._sections["mod_files"] = self._load_mod_files()
+        return self._sections["mod_files"]
+
+    @mod_files.setter
+    def mod_files(self, value: Dict[str, Any]) -> None:
+        self._sections["mod_files"] = value
+        self._dirty.add("mod_files")
+
+    @property
+    def project_ids(self) -> Dict[str, Any]:
+        return self._get_section("project_ids")
+
+    @project_ids.setter
+    def project_ids(self, value: Dict[str, Any]) -> None:
+        self._sections["project_ids"] = value
+        self._dirty.add("project_ids")
+
+    @property
+    def latest_versions(self) -> Dict[str, Any]:
+        return self._get_section("latest_versions")
+
+    @latest_versions.setter
+    def latest_versions(self, value: Dict[str, Any]) -> None:
+        self._sections["latest_versions"] = value
+        self._dirty.add("latest_versions")
+
+    @property
+    def downloaded_files(self) -> Dict[str, Any]:
+        return self._get_section("downloaded_files")
+
+    @downloaded_files.setter
+    def downloaded_files(self, value: Dict[str, Any]) -> None:
+        self._sections["downloaded_files"] = value
+        self._dirty.add("downloaded_files")
+
+    def _get_section(self, name: str) -> Dict[str, Any]:
+        """
+        Get a cache section, reading it from disk on first access.
+
+        Args:
+            name: Top-level section name
+
+        Returns:
+            The section dictionary (empty if unavailable)
+        """
+        if name not in self._sections:
+            self._sections[name] = self._decode_section(name, self._read_section(name) or {})
+        return self._sections[name]
+
+    @staticmethod
+    def _decode_section(name: str, value: Dict[str, Any]) -> Dict[Any, Any]:
+        """
+        Convert a freshly loaded section to its in-memory form.
+
+        Composite keys are stored as ':'-joined strings on disk but kept
+        as tuples in memory, so hot lookups skip the per-call f-string
+        build and hash of a long concatenated key.
+
+        Args:
+            name: Top-level section name
+            value: Section dictionary as loaded from disk
+
+        Returns:
+            Section dictionary with in-memory keys
+        """
+        # Large sections repeat the same strings across entries; dedupe
+        # them into shared objects before they settle into the heap
+        if len(value) >= _DEDUPE_MIN_ENTRIES:
+            value = _dedupe_strings(value, {})
+
+        if name == "latest_versions":
+            # Provider, game version and loader come from tiny fixed
+            # vocabularies; interning them collapses key equality checks
+            # to pointer comparisons and reuses cached string hashes
+            return {
+                tuple(sys.intern(part) for part in k.split(":")): v
+                for k, v in value.items()
+            }
+        if name == "downloaded_files":
+            return {tuple(k.rsplit(":", 1)): v for k, v in value.items()}
+        return value
+
+    @staticmethod
+    def _encode_section(name: str, value: Dict[Any, Any]) -> Dict[str, Any]:
+        """
+        Convert an in-memory section to its on-disk form.
+
+        Inverse of _decode_section: tuple keys are flattened back to the
+        ':'-joined strings the serializers require.
+
+        Args:
+            name: Top-level section name
+            value: Section dictionary with in-memory keys
+
+        Returns:
+            Section dictionary with string keys
+        """
+        if name in ("latest_versions", "downloaded_files"):
+            return {":".join(k): v for k, v in value.items()}
+        return value
+
+    def _shard_path(self, section: str) -> str:
+        """
+        Build the path of a section's shard file.
+
+        Args:
+            section: Top-level section name
+
+        Returns:
+            Path of the shard file next to the main cache file
+        """
+        stem, ext = os.path.splitext(self.cache_file)
+        return f"{stem}.{section}{ext}"
+
+    def _read_blob(self, path: str) -> Any:
+        """
+        Read and decode one cache blob file.
+
+        Args:
+            path: Path of the blob file
+
+        Returns:
+            Decoded contents
+
+        Raises:
+            ValueError: If the file cannot be decoded
+            IOError: If the file cannot be read
+        """
+        raw = Path(path).read_bytes()
+        if raw[:len(_MSGPACK_MAGIC)] == _MSGPACK_MAGIC:
+            if msgpack is None:
+                raise ValueError("msgpack-encoded cache but msgpack is not installed")
+            return msgpack.unpackb(raw[len(_MSGPACK_MAGIC):], raw=False)
+        return _loads_cache(raw)
+
+    def _write_blob(self, path: str, data: Any) -> None:
+        """
+        Atomically encode and write one cache blob file.
+
+        Args:
+            path: Destination path
+            data: Data to serialize
+
+        Raises:
+            IOError: If the file cannot be written
+        """
+        temp_file = f"{path}.tmp"
+        try:
+            with open(temp_file, 'wb') as f:
+                if msgpack is not None:
+                    f.write(_MSGPACK_MAGIC)
+                    f.write(msgpack.packb(data, use_bin_type=True))
+                else:
+                    f.write(_dumps_cache(data))
+            os.replace(temp_file, path)
+        finally:
+            Path(temp_file).unlink(missing_ok=True)
+
+    def _read_section(self, name: str) -> Optional[Any]:
+        """
+        Read one top-level section from the cache file.
+
+        With ijson available only the requested section is parsed; the
+        stdlib fallback decodes the whole file once and fills every
+        section so later accesses are free.
+
+        Args:
+            name: Top-level section name
+
+        Returns:
+            The parsed section value, or None if it could not be read
+        """
+        # Per-section shards take precedence over the legacy monolithic file
+        if name != "last_scan":
+            shard = self._shard_path(name)
+            if os.path.exists(shard):
+                try:
+                    return self._read_blob(shard)
+                except (ValueError, IOError) as e:
+                    self.logger.warning(f"Error loading cache shard {name}: {str(e)}")
+                    return None
+
+        if self._lazy_path is None:
+            return None
+
+        try:
+            with open(self._lazy_path, 'rb') as f:
+                header = f.read(len(_MSGPACK_MAGIC))
+
+            if header == _MSGPACK_MAGIC:
+                if msgpack is None:
+                    self.logger.warning(
+                        "Cache file is msgpack-encoded but msgpack is not installed; starting fresh"
+                    )
+                    return None
+                data = msgpack.unpackb(Path(self._lazy_path).read_bytes()[len(_MSGPACK_MAGIC):], raw=False)
+                for section in _BLOB_SECTIONS:
+                    if section not in self._sections and not os.path.exists(self._shard_path(section)):
+                        self._sections[section] = self._decode_section(section, data.get(section) or {})
+                return data.get(name)
+
+            if ijson is not None:
+                with open(self._lazy_path, 'rb') as f:
+                    return next(ijson.items(f, name), None)
+
+            data = _loads_cache(Path(self._lazy_path).read_bytes())
+            for section in _BLOB_SECTIONS:
+                if section not in self._sections and not os.path.exists(self._shard_path(section)):
+                    self._sections[section] = self._decode_section(section, data.get(section) or {})
+            return data.get(name)
+        except (ValueError, IOError) as e:
+            self.logger.warning(f"Error loading cache section {name}: {str(e)}")
+            self._backup_corrupted()
+            self._lazy_path = None
+            return None
+
+    def _get_db(self) -> Optional[sqlite3.Connection]:
+        """
+        Get the SQLite connection backing mod_files, opening it lazily.
+
+        Callers must hold _db_lock around any statement they run on the
+        returned connection; this method takes the lock itself for the
+        one-time open.
+
+        mod_files entries are written through to an indexed table so a
+        single changed entry no longer forces rewriting the whole
+        section on every save. Any legacy mod_files section found in
+        the JSON cache is imported into the table on first open.
+
+        Returns:
+            Open connection, or None if SQLite is unavailable
+        """
+        with self._db_lock:
+            if self._db is None and not self._db_error:
+                try:
+                    # check_same_thread off: set_mod_file_info runs on
+                    # the checker's worker threads; _db_lock serializes
+                    # access to the shared connection
+                    db = sqlite3.connect(
+                        f"{self.cache_file}.db",
+                        isolation_level=None,
+                        check_same_thread=False
+                    )
+                    db.execute("PRAGMA journal_mode=WAL")
+                    db.execute("PRAGMA synchronous=NORMAL")
+                    db.execute(
+                        "CREATE TABLE IF NOT EXISTS mod_files (path TEXT PRIMARY KEY, info BLOB)"
+                    )
+                    self._db = db
+
+                    # One-time migration of a legacy in-file section
+                    if db.execute("SELECT 1 FROM mod_files LIMIT 1").fetchone() is None:
+                        legacy = _decode_mod_files(self._read_section("mod_files") or {})
+                        if legacy:
+                            db.executemany(
+                                "INSERT OR REPLACE INTO mod_files (path, info) VALUES (?, ?)",
+                                ((path, _dumps_cache(info)) for path, info in legacy.items())
+                            )
+                except sqlite3.Error as e:
+                    self.logger.error(f"Error opening mod file database: {str(e)}")
+                    self._db_error = True
+
+        return self._db
+
+    def _load_mod_files(self) -> Dict[str, Any]:
+        """
+        Materialize the mod_files view from its backing store.
+
+        Returns:
+            Dictionary of mod file info keyed by path
+        """
+        db = self._get_db()
+        if db is None:
+            return _decode_mod_files(self._read_section("mod_files") or {})
+
+        try:
+            with self._db_lock:
+                rows = db.execute("SELECT path, info FROM mod_files").fetchall()
+            return {path: _loads_cache(info) for path, info in rows}
+        except (sqlite3.Error, ValueError) as e:
+            self.logger.error(f"Error reading mod file database: {str(e)}")
+            return {}
+
+    def _backup_corrupted(self) -> None:
+        """Rename a corrupted cache file out of the way as a backup."""
+        if not os.path.exists(self.cache_file):
+            return
+
+        backup_file = f"{self.cache_file}.bak"
+        try:
+            os.rename(self.cache_file, backup_file)
+            self.logger.warning(f"Corrupted cache file renamed to {backup_file}")
+        except OSError:
+            self.logger.error(f"Failed to create backup of corrupted cache file")
+
+    @classmethod
+    def load(cls, cache_file: str = DEFAULT_CACHE_FILE) -> 'ModCache':
+        """
+        Load cache from file or return a new empty cache.
+
+        Sections are read lazily: only last_scan is parsed up front, and
+        each sub-dict is deserialized the first time it is accessed, so
+        runs that touch a single section skip the rest of the file.
+
+        Args:
+            cache_file: Path to the cache file
+
+        Returns:
+            ModCache instance with loaded data or defaults
+        """
+        cache = cls(cache_file=cache_file)
+
+        if os.path.exists(cache_file):
+            cache._lazy_path = cache_file
+            cache.last_scan = cache._read_section("last_scan")
+            cache._update_results = cache._read_section("update_results")
+            logging.info(f"Loaded cache from {cache_file}")
+
+        return cache
+    
+    def save(self) -> bool:
+        """
+        Save cache to disk, writing only sections that changed.
+
+        Each section lives in its own shard file next to the main cache
+        file, so a run that only refreshed latest_versions rewrites that
+        one shard instead of re-encoding the whole cache. A section read
+        from a legacy monolithic file gets its shard written once on the
+        first save after migration.
+
+        Returns:
+            True if save was successful, False otherwise
+        """
+        # Update last scan timestamp
+        self.last_scan = datetime.now().isoformat()
+
+        try:
+            for section in _BLOB_SECTIONS:
+                shard = self._shard_path(section)
+                if section in self._dirty or not os.path.exists(shard):
+                    self._write_blob(shard, self._encode_section(section, getattr(self, section)))
+
+            # mod_files lives in the SQLite store and only gets a shard
+            # when that store is unavailable
+            if self._get_db() is None:
+                shard = self._shard_path("mod_files")
+                if "mod_files" in self._dirty or not os.path.exists(shard):
+                    self._write_blob(shard, _encode_mod_files(self.mod_files))
+
+            # The main file carries the scan timestamp and, when one is
+            # stored, the whole-run update result record
+            main_blob: Dict[str, Any] = {"last_scan": self.last_scan}
+            if self._update_results is not None:
+                main_blob["update_results"] = self._update_results
+            self._write_blob(self.cache_file, main_blob)
+
+            self._dirty.clear()
+            self.logger.info(f"Cache saved to {self.cache_file}")
+            return True
+        except IOError as e:
+            self.logger.error(f"Error saving cache: {str(e)}")
+            return False
+    
+    def is_expired(self, expiry_hours: int = DEFAULT_CACHE_EXPIRY_HOURS) -> bool:
+        """
+        Check if the cache has expired.
+        
+        Args:
+            expiry_hours: Number of hours after which cache is considered expired
+            
+        Returns:
+            True if the cache has expired, False otherwise
+        """
+        if not self.last_scan:
+            return True
+
+        try:
+            # Compare raw POSIX floats instead of datetime/timedelta objects
+            age_seconds = time.time() - _parse_iso_ts(self.last_scan)
+            if age_seconds > expiry_hours * 3600:
+                self.logger.info(f"Cache expired (age: {age_seconds / 3600:.1f} hours)")
+                return True
+
+            return False
+        except (ValueError, TypeError):
+            self.logger.warning("Invalid last_scan timestamp, considering cache expired")
+            return True
+
+    def get_cached_updates(self, signature: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the stored whole-run update results for a configuration signature.
+
+        Args:
+            signature: Signature of the current configuration and mod set
+
+        Returns:
+            The stored update list if the signature matches and the record
+            has not expired, None otherwise
+        """
+        record = self._update_results
+        if not record or record.get("signature") != signature:
+            return None
+
+        try:
+            if time.time() - float(record.get("timestamp", 0)) > UPDATE_RESULTS_TTL_SECONDS:
+                return None
+        except (ValueError, TypeError):
+            return None
+
+        return record.get("updates")
+
+    def set_cached_updates(self, signature: str, updates: List[Dict[str, Any]]) -> None:
+        """
+        Store whole-run update results keyed by a configuration signature.
+
+        Args:
+            signature: Signature of the current configuration and mod set
+            updates: Update list produced by the run
+        """
+        self._update_results = {
+            "signature": signature,
+            "timestamp": time.time(),
+            "updates": updates
+        }
+
+    def get_project_ids(self, mod_id: str) -> Dict[str, Optional[str]]:
+        """
+        Get cached project IDs for a mod.
+        
+        Args:
+            mod_id: The mod ID to lookup
+            
+        Returns:
+            Dictionary containing provider project IDs or None
+        """
+        if mod_id in self.project_ids:
+            return self.project_ids[mod_id]
+        return {"modrinth": None, "curseforge": None}
+    
+    def set_project_ids(self, mod_id: str, modrinth_id: Optional[str] = None, curseforge_id: Optional[str] = None) -> None:
+        """
+        Store project IDs for a mod in the cache.
+        
+        Args:
+            mod_id: The mod ID
+            modrinth_id: Modrinth project ID
+            curseforge_id: CurseForge project ID
+        """
+        if mod_id not in self.project_ids:
+            self.project_ids[mod_id] = {}
+            
+        # Only update if the value is not None
+        if modrinth_id is not None:
+            self.project_ids[mod_id]["modrinth"] = modrinth_id
+        if curseforge_id is not None:
+            self.project_ids[mod_id]["curseforge"] = curseforge_id
+        self._dirty.add("project_ids")
+    
+    def get_mod_file_info(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached information about a mod file.
+        
+        Args:
+            file_path: Absolute path to the mod file
+            
+        Returns:
+            Dictionary containing file info or None if not in cache
+        """
+        return self.mod_files.get(file_path)
+    
+    def set_mod_file_info(self, file_path: str, info: Dict[str, Any]) -> None:
+        """
+        Store information about a mod file in the cache.
+        
+        Args:
+            file_path: Absolute path to the mod file
+            info: Dictionary containing file information
+        """
+        self.mod_files[file_path] = info
+        self._dirty.add("mod_files")
+
+        db = self._get_db()
+        if db is not None:
+            try:
+                with self._db_lock:
+                    db.execute(
+                        "INSERT OR REPLACE INTO mod_files (path, info) VALUES (?, ?)",
+                        (file_path, _dumps_cache(info))
+                    )
+            except sqlite3.Error as e:
+                self.logger.error(f"Error writing mod file database: {str(e)}")
+    
+    def remove_mod_file(self, file_path: str) -> None:
+        """
+        Remove a mod file from the cache.
+        
+        Args:
+            file_path: Absolute path to the mod file
+        """
+        if file_path in self.mod_files:
+            del self.mod_files[file_path]
+            self._dirty.add("mod_files")
+
+        db = self._get_db()
+        if db is not None:
+            try:
+                with self._db_lock:
+                    db.execute("DELETE FROM mod_files WHERE path = ?", (file_path,))
+            except sqlite3.Error as e:
+                self.logger.error(f"Error writing mod file database: {str(e)}")
+    
+    def version_key_factory(self, game_version: str, mod_loader: str) -> Callable[[str, str], tuple]:
+        """
+        Build a key constructor specialized for one scan's fixed pair.
+
+        A scan iterates one (game_version, mod_loader) pair across many
+        (provider, project_id) pairs; binding the fixed components once
+        lets hot loops skip two intern calls per lookup.
+
+        Args:
+            game_version: Minecraft version
+            mod_loader: Mod loader type
+
+        Returns:
+            Callable mapping (provider, project_id) to a cache key for
+            use with get_version_info_by_key/set_version_info_by_key
+        """
+        gv = sys.intern(game_version)
+        ml = sys.intern(mod_loader)
+
+        def key_fn(provider: str, project_id: str) -> tuple:
+            return (sys.intern(provider), project_id, gv, ml)
+
+        return key_fn
+
+    def get_version_info_by_key(self, key: tuple, cache_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get cached version information by a prebuilt key.
+
+        Args:
+            key: Key built by version_key_factory
+            cache_version: Optional version stamp; entries written under
+                a different stamp are treated as misses
+
+        Returns:
+            Dictionary containing version info or None if not in cache
+        """
+        entry = self.latest_versions.get(key)
+        if entry is None:
+            return None
+
+        # Wrapped entries expire individually based on their own TTL
+        if "fetched_at" in entry and "data" in entry:
+            if cache_version is not None and entry.get("cache_version") != cache_version:
+                return None
+            if time.time() - entry["fetched_at"] > entry.get("ttl_seconds", MIN_VERSION_TTL_SECONDS):
+                return None
+            return entry["data"]
+
+        # Legacy bare entry from an older cache file; unstamped, so a
+        # stamped lookup must treat it as a miss
+        if cache_version is not None:
+            return None
+        return entry
+
+    def set_version_info_by_key(self, key: tuple, version_info: Dict[str, Any], cache_version: Optional[str] = None) -> None:
+        """
+        Store version information under a prebuilt key.
+
+        Args:
+            key: Key built by version_key_factory
+            version_info: Dictionary containing version information
+            cache_version: Optional version stamp recorded on the entry
+        """
+        entry = {
+            "data": version_info,
+            "ttl_seconds": _adaptive_ttl(version_info.get("date_published")),
+            "fetched_at": time.time()
+        }
+        if cache_version is not None:
+            entry["cache_version"] = cache_version
+        self.latest_versions[key] = entry
+        self._dirty.add("latest_versions")
+
+    def get_version_info(self, provider: str, project_id: str, game_version: str, mod_loader: str, cache_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get cached version information for a mod.
+
+        Args:
+            provider: Provider name ('modrinth' or 'curseforge')
+            project_id: Provider-specific project ID
+            game_version: Minecraft version
+            mod_loader: Mod loader type
+            cache_version: Optional version stamp; entries written under
+                a different stamp are treated as misses
+
+        Returns:
+            Dictionary containing version info or None if not in cache
+        """
+        key = (sys.intern(provider), project_id, sys.intern(game_version), sys.intern(mod_loader))
+        return self.get_version_info_by_key(key, cache_version=cache_version)
+
+    def set_version_info(self, provider: str, project_id: str, game_version: str, mod_loader: str, version_info: Dict[str, Any], cache_version: Optional[str] = None) -> None:
+        """
+        Store version information for a mod in the cache.
+
+        Args:
+            provider: Provider name ('modrinth' or 'curseforge')
+            project_id: Provider-specific project ID
+            game_version: Minecraft version
+            mod_loader: Mod loader type
+            version_info: Dictionary containing version information
+            cache_version: Optional version stamp recorded on the entry
+        """
+        key = (sys.intern(provider), project_id, sys.intern(game_version), sys.intern(mod_loader))
+        self.set_version_info_by_key(key, version_info, cache_version=cache_version)
+    
+    def get_download_info(self, mod_name: str, version: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached download information for a mod version.
+        
+        Args:
+            mod_name: Name of the mod
+            version: Version of the mod
+            
+        Returns:
+            Dictionary containing download info or None if not in cache
+        """
+        return self.downloaded_files.get((mod_name, version))
+    
+    def set_download_info(self, mod_name: str, version: str, download_info: Dict[str, Any]) -> None:
+        """
+        Store download information for a mod version in the cache.
+        
+        Args:
+            mod_name: Name of the mod
+            version: Version of the mod
+            download_info: Dictionary containing download information
+        """
+        self.downloaded_files[(mod_name, version)] = download_info
+        self._dirty.add("downloaded_files")
+    
+    def clean_up(self, processed_files: Optional[Set[str]] = None) -> None:
+        """
+        Clean up the cache by removing entries for files that no longer exist.
+        
+        Args:
+            processed_files: Set of file paths that were processed in the current run
+        """
+        if processed_files:
+            stale = self.mod_files.keys() - processed_files
+            for file_path in stale:
+                del self.mod_files[file_path]
+
+            if stale:
+                self._dirty.add("mod_files")
+                db = self._get_db()
+                if db is not None:
+                    try:
+                        with self._db_lock:
+                            db.executemany(
+                                "DELETE FROM mod_files WHERE path = ?",
+                                ((path,) for path in stale)
+                            )
+                    except sqlite3.Error as e:
+                        self.logger.error(f"Error writing mod file database: {str(e)}")
+
+                self.logger.info(f"Removed {len(stale)} deleted files from cache")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"Removed from cache: {sorted(stale)}")
+                    
+    def prune_old_versions(self, max_age_days: int = 30) -> int:
+        """
+        Remove version information older than the specified age.
+        
+        Args:
+            max_age_days: Maximum age in days for version information
+            
+        Returns:
+            Number of pruned entries
+        """
+        if not self.latest_versions:
+            return 0
+            
+        threshold_ts = time.time() - max_age_days * 86400
+        invalid_dates = 0
+
+        def _keep(version_info: Dict[str, Any]) -> bool:
+            # Unwrap TTL-carrying entries; legacy entries are bare
+            nonlocal invalid_dates
+            info = version_info.get("data", version_info)
+            date_str = info.get('date_published')
+            if not date_str:
+                return True
+            try:
+                return _parse_iso_ts(date_str) >= threshold_ts
+            except (ValueError, TypeError):
+                invalid_dates += 1
+                return True
+
+        stale_keys = [k for k, v in self.latest_versions.items() if not _keep(v)]
+        pruned_count = len(stale_keys)
+
+        # Deleting a large fraction entry-by-entry churns the dict's
+        # internal table; past ~1/8 stale it is cheaper to rebuild it at
+        # the right size in one pass
+        if pruned_count > len(self.latest_versions) // 8:
+            stale = set(stale_keys)
+            self.latest_versions = {
+                k: v for k, v in self.latest_versions.items() if k not in stale
+            }
+        else:
+            for key in stale_keys:
+                del self.latest_versions[key]
+
+        if pruned_count:
+            self._dirty.add("latest_versions")
+        
+        if invalid_dates:
+            self.logger.warning(f"Skipped {invalid_dates} version entries with invalid dates")
+
+        if pruned_count > 0:
+            self.logger.info(f"Pruned {pruned_count} old version entries from cache")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Pruned version keys: {stale_keys}")
+
+        return pruned_count
@@ -1,837 +1,1471 @@
-"""
-Module for checking and updating Minecraft mods.
-
-This module provides the main functionality for scanning mod directories,
-checking for updates, and downloading newer versions.
-"""
-
-import os
-import sys
-import json
-import logging
-import datetime
-from typing import Dict, List, Any, Optional, Set, Tuple
-from pathlib import Path
-from tqdm import tqdm
-
-
-class TqdmLoggingHandler(logging.Handler):
-    """
-    Custom logging handler that writes messages using tqdm.write().
-    This prevents progress bars from being broken by log messages.
-    """
-    def emit(self, record):
-        try:
-            msg = self.format(record)
-            # Use tqdm.write which respects progress bars
-            tqdm.write(msg)
-            self.flush()
-        except Exception:
-            self.handleError(record)
-
-from data.api.modrinth import ModrinthProvider
-from data.api.curseforge import CurseForgeProvider
-from data.utils.file import (
-    get_mod_metadata, 
-    find_mod_files, 
-    ensure_directory,
-    download_file,
-    normalize_path
-)
-from data.utils.version import compare_versions
-from data.config import Config
-from data.cache.manager import ModCache
-from data.__version__ import (
-    __version__,
-    __release_date__,
-    __author__,
-    __license__,
-    PACKAGE_NAME,
-    REPOSITORY_URL
-)
-
-
-class ModUpdateChecker:
-    """
-    Main class for checking and updating Minecraft mods.
-    
-    This class handles scanning mod directories, checking for updates,
-    and downloading updated mods.
-    """
-    
-    def __init__(
-        self,
-        config: Config,
-        cache: ModCache,
-        force_update: bool = False
-    ):
-        """
-        Initialize the mod update checker.
-        
-        Args:
-            config: Configuration object
-            cache: Cache manager object
-            force_update: Whether to force update checks, ignoring cache
-        """
-        self.config = config
-        self.cache = cache
-        self.force_update = force_update
-        self.logger = logging.getLogger(__name__)
-        
-        # Initialize API providers
-        self.providers = {}
-        self._init_providers()
-        
-        # Configure logging for cleaner console output
-        self._configure_console_logging()
-        
-    def _configure_console_logging(self) -> None:
-        """Configure logging to reduce console clutter and preserve progress bars."""
-        # Get the root logger
-        root_logger = logging.getLogger()
-        
-        # Remove existing console handlers
-        for handler in list(root_logger.handlers):
-            if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
-                root_logger.removeHandler(handler)
-        
-        # Add a new tqdm-compatible console handler
-        tqdm_handler = TqdmLoggingHandler()
-        tqdm_handler.setLevel(logging.ERROR)  # Only show ERROR and CRITICAL in console
-        compact_format = logging.Formatter('%(levelname)s: %(message)s')
-        tqdm_handler.setFormatter(compact_format)
-        root_logger.addHandler(tqdm_handler)
-    
-    def _init_providers(self) -> None:
-        """Initialize API providers based on configuration."""
-        # Initialize Modrinth provider (always available)
-        self.providers["modrinth"] = ModrinthProvider()
-        
-        # Initialize CurseForge provider if API key is available
-        if self.config.curseforge_api_key:
-            self.providers["curseforge"] = CurseForgeProvider(
-                api_key=self.config.curseforge_api_key
-            )
-        else:
-            self.logger.warning(
-                "CurseForge API key not set. CurseForge provider will not be available."
-            )
-    
-    def check_updates(self) -> List[Dict[str, Any]]:
-        """
-        Check for updates to mods.
-        
-        Returns:
-            List of dictionaries containing update information
-        """
-        # Validate mod directories
-        mod_dirs = self.config.validate_mod_directories()
-        if not mod_dirs:
-            self.logger.error("No valid mod directories found")
-            return []
-            
-        # Scan for mod files
-        mod_files = []
-        total_mods = 0
-        
-        # Create a scanning progress bar with status information
-        scan_bar = tqdm(
-            desc="📁 Scan", 
-            total=len(mod_dirs),
-            unit="dir", 
-            bar_format="{desc}: {percentage:3.0f}% |{bar}| {n_fmt}/{total_fmt}",
-            position=0,
-            leave=False,  # Don't leave the bar after completion
-            ncols=60,  # Further reduced width to prevent line wrapping
-            file=sys.stdout  # Explicitly set output to stdout
-        )
-        
-        try:
-            # Scan each directory
-            for mod_dir in mod_dirs:
-                self.logger.debug(f"Scanning directory: {mod_dir}")
-                found_files = find_mod_files(mod_dir)
-                mod_files.extend(found_files)
-                total_mods += len(found_files)
-                
-                # Only update the description when the mod count changes significantly (every 5 mods)
-                if total_mods % 5 == 0 or total_mods == 1:
-                    scan_bar.set_description(f"📁 {total_mods}m")
-                scan_bar.update(1)
-        finally:
-            # Make sure to clear the current line and close the bar properly
-            scan_bar.clear()
-            scan_bar.close()
-            print("", end="\r", flush=True)  # Ensure the line is cleared
-            print("", flush=True)  # Add a blank line after the progress bar
-            
-        # No mods found
-        if not mod_files:
-            self.logger.warning("No mod files found in configured directories")
-            tqdm.write("\nNo mod files found in the configured directories.")
-            print("", end="\r", flush=True)  # Ensure the line is cleared
-            return []
-            
-        # Track processed files for cache cleanup
-        processed_files = set()
-        
-        # Find updates
-        updates = []
-        
-        # Create a processing progress bar with update counter
-        process_bar = tqdm(
-            mod_files,
-            desc=f"🔍 {total_mods}m",
-            unit="mod",
-            bar_format="{desc} [{n_fmt}/{total_fmt}] {percentage:3.0f}% |{bar}|",
-            position=0,
-            leave=True,  # Leave the final bar visible after completion
-            ncols=60,  # Further reduced width to prevent line wrapping
-            file=sys.stdout  # Explicitly set output to stdout
-        )
-        
-        # Track the last update count to only update description when it changes
-        last_update_count = 0
-        
-        try:
-            # Process each mod file
-            for file_path in process_bar:
-                normalized_path = normalize_path(file_path)
-                processed_files.add(normalized_path)
-                
-                try:
-                    # Extract metadata from the mod file
-                    mod_metadata = self._get_mod_metadata(normalized_path)
-                    
-                    # Skip files without a mod ID
-                    if not mod_metadata["mod_id"]:
-                        # Log this warning only to the file, not to console
-                        self.logger.warning(f"Could not determine mod ID for {file_path}")
-                        continue
-                        
-                    # Skip ignored mods
-                    if mod_metadata["mod_id"] in self.config.ignore_mods:
-                        self.logger.info(f"Skipping ignored mod: {mod_metadata['mod_id']}")
-                        continue
-                        
-                    # Get project IDs from providers
-                    project_ids = self._get_project_ids(mod_metadata)
-                    
-                    # Check for updates from providers
-                    update_info = self._check_for_update(mod_metadata, project_ids)
-                    
-                    # If an update is available, add it to the list
-                    if update_info and update_info.get("update_available"):
-                        updates.append(update_info)
-                        # Only update the description when the update count changes
-                        if len(updates) != last_update_count:
-                            last_update_count = len(updates)
-                            process_bar.set_description(
-                                f"🔍 {total_mods}m/{len(updates)}u"
-                            )
-                except Exception as e:
-                    # Log error without breaking the progress bar
-                    process_bar.clear()  # Clear the current line
-                    self.logger.error(f"Error processing {file_path}: {str(e)}")
-                    # Resume the progress bar
-                    process_bar.refresh()
-        
-        finally:
-            # Make sure to clear and close the bar properly
-            process_bar.clear()
-            process_bar.close()
-            print("", end="\r", flush=True)  # Ensure the line is cleared
-            print("", flush=True)  # Add a blank line after the progress bar
-            
-        # Clean up cache if needed
-        self.cache.clean_up(processed_files)
-        self.cache.save()
-        
-        # Print a summary of the update check
-        update_count = len(updates)
-        if update_count > 0:
-            tqdm.write(f"✅ Found {update_count} mod{'' if update_count == 1 else 's'} with available updates")
-        else:
-            tqdm.write("✅ All mods are up to date")
-        
-        return updates
-    
-    def _get_mod_metadata(self, file_path: str) -> Dict[str, Any]:
-        """
-        Get metadata for a mod file, either from cache or by parsing the file.
-        
-        Args:
-            file_path: Path to the mod file
-            
-        Returns:
-            Dictionary containing mod metadata
-        """
-        # Check if we have cached metadata
-        cached_info = None
-        if not self.force_update:
-            cached_info = self.cache.get_mod_file_info(file_path)
-            
-        if cached_info:
-            self.logger.debug(f"Using cached metadata for {file_path}")
-            return cached_info
-            
-        # Extract metadata from the file
-        self.logger.debug(f"Extracting metadata from {file_path}")
-        metadata = get_mod_metadata(file_path)
-        
-        # Store in cache for future use
-        self.cache.set_mod_file_info(file_path, metadata)
-        
-        return metadata
-    
-    def _get_project_ids(self, mod_metadata: Dict[str, Any]) -> Dict[str, Optional[str]]:
-        """
-        Get project IDs for a mod from various providers.
-        
-        Args:
-            mod_metadata: Mod metadata dictionary
-            
-        Returns:
-            Dictionary with provider names as keys and project IDs as values
-        """
-        mod_id = mod_metadata["mod_id"]
-        
-        # Check cache first
-        cached_ids = self.cache.get_project_ids(mod_id)
-        if not self.force_update and all(cached_ids.values()):
-            return cached_ids
-            
-        # Update project IDs from providers
-        updated_ids = {}
-        
-        # Try primary provider first
-        primary = self.config.default_mod_provider
-        if primary in self.providers and not cached_ids.get(primary):
-            project_id = self.providers[primary].get_project_id(mod_id)
-            updated_ids[primary] = project_id
-            
-        # Then try fallback provider
-        fallback = self.config.fallback_mod_provider
-        if fallback in self.providers and not cached_ids.get(fallback):
-            project_id = self.providers[fallback].get_project_id(mod_id)
-            updated_ids[fallback] = project_id
-            
-        # Update cache with new values
-        if updated_ids:
-            self.cache.set_project_ids(
-                mod_id,
-                modrinth_id=updated_ids.get("modrinth", cached_ids.get("modrinth")),
-                curseforge_id=updated_ids.get("curseforge", cached_ids.get("curseforge"))
-            )
-            
-        # Merge cached and updated values
-        result = cached_ids.copy()
-        result.update({k: v for k, v in updated_ids.items() if v is not None})
-        
-        return result
-    
-    def _check_for_update(
-        self, 
-        mod_metadata: Dict[str, Any], 
-        project_ids: Dict[str, Optional[str]]
-    ) -> Optional[Dict[str, Any]]:
-        """
-        Check if an update is available for a mod.
-        
-        Args:
-            mod_metadata: Mod metadata dictionary
-            project_ids: Dictionary of project IDs by provider
-            
-        Returns:
-            Update information dictionary or None if no update available
-        """
-        mod_id = mod_metadata["mod_id"]
-        current_version = mod_metadata.get("version")
-        
-        if not current_version:
-            self.logger.warning(f"Could not determine current version for {mod_id}")
-            return None
-            
-        self.logger.debug(f"Checking updates for {mod_id} (current: {current_version})")
-        
-        # Get the latest version from providers
-        latest_version_info = self._get_latest_version(
-            project_ids,
-            self.config.minecraft_version,
-            self.config.get_normalized_mod_loader()
-        )
-        
-        if not latest_version_info:
-            self.logger.info(f"No update information found for {mod_id}")
-            return None
-            
-        latest_version = latest_version_info.get("version_number")
-        if not latest_version:
-            self.logger.warning(f"No version number in update info for {mod_id}")
-            return None
-            
-        # Check if update is available
-        update_available = compare_versions(current_version, latest_version)
-        
-        if update_available:
-            self.logger.debug(f"Update available for {mod_id}: {current_version} -> {latest_version}")
-        else:
-            self.logger.debug(f"No update needed for {mod_id} (current: {current_version}, latest: {latest_version})")
-            
-        # Prepare update information
-        update_info = {
-            "mod_id": mod_id,
-            "mod_name": mod_metadata.get("mod_name", mod_id),
-            "current_file": mod_metadata.get("file_name", ""),
-            "current_version": current_version,
-            "latest_version": latest_version,
-            "update_available": update_available,
-            "version_info": latest_version_info,
-            "provider": latest_version_info.get("provider"),
-            "metadata": mod_metadata
-        }
-        
-        return update_info
-    
-    def _get_latest_version(
-        self,
-        project_ids: Dict[str, Optional[str]],
-        game_version: str,
-        mod_loader: str
-    ) -> Optional[Dict[str, Any]]:
-        """
-        Get the latest version information for a mod.
-        
-        Args:
-            project_ids: Dictionary of project IDs by provider
-            game_version: Minecraft version to filter by
-            mod_loader: Mod loader to filter by
-            
-        Returns:
-            Dictionary containing version information or None if not found
-        """
-        # Try to get from cache first
-        cached_versions = {}
-        for provider, project_id in project_ids.items():
-            if not project_id:
-                continue
-                
-            if not self.force_update:
-                cached_info = self.cache.get_version_info(
-                    provider, project_id, game_version, mod_loader
-                )
-                if cached_info:
-                    cached_versions[provider] = cached_info
-        
-        # If we have cached versions, use them
-        if cached_versions:
-            # Sort by provider preference
-            primary = self.config.default_mod_provider
-            fallback = self.config.fallback_mod_provider
-            
-            if primary in cached_versions:
-                return cached_versions[primary]
-            elif fallback in cached_versions:
-                return cached_versions[fallback]
-        
-        # Otherwise, query providers
-        versions = {}
-        
-        # Try providers in order of preference
-        primary = self.config.default_mod_provider
-        fallback = self.config.fallback_mod_provider
-        
-        for provider_name in [primary, fallback]:
-            if provider_name in self.providers and project_ids.get(provider_name):
-                provider = self.providers[provider_name]
-                project_id = project_ids[provider_name]
-                
-                version_info = provider.get_latest_version(
-                    project_id, game_version, mod_loader
-                )
-                
-                if version_info:
-                    # Store in cache
-                    self.cache.set_version_info(
-                        provider_name, project_id, game_version, mod_loader, version_info
-                    )
-                    versions[provider_name] = version_info
-        
-        # Return based on preference
-        if primary in versions:
-            return versions[primary]
-        elif fallback in versions:
-            return versions[fallback]
-            
-        return None
-    
-    def download_updates(
-        self, 
-        updates: List[Dict[str, Any]], 
-        dry_run: bool = False
-    ) -> List[Dict[str, Any]]:
-        """
-        Download updates for mods.
-        
-        Args:
-            updates: List of update information dictionaries
-            dry_run: If True, only simulate downloads
-            
-        Returns:
-            List of successfully downloaded updates
-        """
-        if not updates:
-            return []
-            
-        # Ensure download directory exists
-        download_dir = self.config.get_absolute_download_directory()
-        if not dry_run and not self.config.create_download_directory():
-            self.logger.error(f"Failed to create download directory: {download_dir}")
-            return []
-            
-        successful_downloads = []
-        
-        tqdm.write(f"Downloading {len(updates)} mod updates...")
-        
-        # Create download progress bar
-        download_bar = tqdm(
-            updates, 
-            desc="⬇️ DL", 
-            unit="mod", 
-            position=0, 
-            leave=True,  # Leave the bar visible after completion
-            bar_format="{desc}: {percentage:3.0f}% |{bar}| {n_fmt}/{total_fmt}",
-            ncols=60,  # Further reduced width to prevent line wrapping
-            file=sys.stdout  # Explicitly set output to stdout
-        )
-        
-        try:
-            # Process each update
-            for update in download_bar:
-                mod_id = update["mod_id"]
-                mod_name = update["mod_name"]
-                provider = update["provider"]
-                version_info = update["version_info"]
-                latest_version = update["latest_version"]
-                
-                if provider not in self.providers:
-                    # Log error without breaking the progress bar
-                    download_bar.clear()  # Clear the current line
-                    self.logger.error(f"Provider {provider} not available for {mod_id}")
-                    download_bar.refresh()  # Resume the progress bar
-                    continue
-                    
-                # Generate output filename
-                output_filename = self._generate_output_filename(mod_id, mod_name, latest_version)
-                output_path = os.path.join(download_dir, output_filename)
-                
-                self.logger.debug(f"Downloading {mod_id} v{latest_version} to {output_path}")
-                
-                if dry_run:
-                    self.logger.info(f"[DRY RUN] Would download {mod_id} v{latest_version}")
-                    successful_downloads.append(update)
-                    continue
-                    
-                # Perform the download
-                success = self.providers[provider].download_mod(version_info, output_path)
-                
-                if success:
-                    self.logger.debug(f"Successfully downloaded {mod_id} v{latest_version}")
-                    successful_downloads.append(update)
-                else:
-                    # Log error without breaking the progress bar
-                    download_bar.clear()  # Clear the current line
-                    self.logger.error(f"Failed to download {mod_id} v{latest_version}")
-                    download_bar.refresh()  # Resume the progress bar
-                
-        finally:
-            # Make sure to clear and close the bar properly
-            download_bar.clear()
-            download_bar.close()
-            print("", end="\r", flush=True)  # Ensure the line is cleared
-            print("", flush=True)  # Add a blank line after the progress bar
-            
-        return successful_downloads
-    
-    def _generate_output_filename(
-        self, 
-        mod_id: str, 
-        mod_name: str, 
-        version: str
-    ) -> str:
-        """
-        Generate an output filename for a downloaded mod.
-        
-        Args:
-            mod_id: Mod ID
-            mod_name: Mod name
-            version: Version string
-            
-        Returns:
-            Output filename
-        """
-        # Use mod name if available, fallback to mod ID
-        base_name = mod_name.replace(" ", "_") if mod_name else mod_id
-        
-        # Sanitize filename
-        base_name = "".join(c for c in base_name if c.isalnum() or c in "_-")
-        
-        # Create filename with version
-        filename = f"{base_name}-{version}.jar"
-        
-        return filename
-        
-    def write_update_report(self, updates: List[Dict[str, Any]]) -> Optional[str]:
-        """
-        Write a report of available updates to a file.
-        
-        Args:
-            updates: List of update information dictionaries
-            
-        Returns:
-            Path to the report file or None if writing failed
-        """
-        if not updates:
-            self.logger.info("No updates to report")
-            return None
-            
-        try:
-            # Create reports directory if needed
-            report_dir = os.path.join(os.path.dirname(self.config.config_file), "reports")
-            if not ensure_directory(report_dir):
-                self.logger.error(f"Failed to create reports directory: {report_dir}")
-                return None
-                
-            # Generate report filename with timestamp
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            report_file = os.path.join(report_dir, f"update_report_{timestamp}.txt")
-            
-            # Write report
-            with open(report_file, 'w', encoding='utf-8') as f:
-                f.write(f"=== {PACKAGE_NAME} Mod Update Report ===\n")
-                f.write(f"{PACKAGE_NAME} Version: {__version__} (Released: {__release_date__})\n")
-                f.write(f"Report Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Minecraft Version: {self.config.minecraft_version}\n")
-                f.write(f"Mod Loader: {self.config.mod_loader}\n")
-                f.write(f"Repository: {REPOSITORY_URL}\n")
-                f.write(f"License: {__license__}\n")
-                f.write("\n")
-                
-                f.write(f"Found {len(updates)} mods with available updates:\n\n")
-                
-                for i, update in enumerate(updates, 1):
-                    mod_id = update["mod_id"]
-                    mod_name = update["mod_name"]
-                    current_version = update["current_version"]
-                    latest_version = update["latest_version"]
-                    provider = update["provider"]
-                    version_info = update.get("version_info", {})
-                    
-                    f.write(f"{i}. {mod_name} ({mod_id})\n")
-                    f.write(f"   Current Version: {current_version}\n")
-                    f.write(f"   Latest Version: {latest_version}\n")
-                    f.write(f"   Provider: {provider}\n")
-                    
-                    # Get and write mod page URL with fallbacks
-                    mod_page_url = version_info.get("mod_page_url")
-                    project_id = version_info.get("project_id")
-                    
-                    # Provider-specific fallback URLs for mod page
-                    if not mod_page_url:
-                        if provider == "modrinth" and project_id:
-                            mod_page_url = f"https://modrinth.com/mod/{project_id}"
-                        elif provider == "curseforge" and project_id:
-                            mod_page_url = f"https://www.curseforge.com/minecraft/mc-mods/{project_id}"
-                        # Additional fallback for CurseForge using slug if available
-                        elif provider == "curseforge" and version_info.get("slug"):
-                            mod_page_url = f"https://www.curseforge.com/minecraft/mc-mods/{version_info['slug']}"
-                        # Final fallback using mod_id
-                        else:
-                            # Try to construct a generic URL based on provider
-                            if provider == "modrinth":
-                                mod_page_url = f"https://modrinth.com/mod/{mod_id}"
-                            elif provider == "curseforge":
-                                mod_page_url = f"https://www.curseforge.com/minecraft/mc-mods/{mod_id}"
-                    
-                    # Get download URL with comprehensive fallbacks
-                    download_url = None
-                    direct_jar_url = None
-                    
-                    # Try to get URL from files array first (most reliable)
-                    if "files" in version_info and version_info["files"]:
-                        # First try to find a direct .jar URL
-                        for file_info in version_info["files"]:
-                            if "download_url" in file_info and file_info["download_url"].lower().endswith('.jar'):
-                                direct_jar_url = file_info["download_url"]
-                                download_url = direct_jar_url
-                                break
-                        
-                        # If no direct .jar URL found, use the first available download URL
-                        if not download_url:
-                            for file_info in version_info["files"]:
-                                if "download_url" in file_info:
-                                    download_url = file_info["download_url"]
-                                    break
-                    
-                    # Fall back to direct download_url if available
-                    if not download_url and "download_url" in version_info:
-                        download_url = version_info["download_url"]
-                        # Check if this is a direct .jar URL
-                        if download_url and download_url.lower().endswith('.jar'):
-                            direct_jar_url = download_url
-                    
-                    # Provider-specific fallback download URLs
-                    if not download_url:
-                        if provider == "modrinth" and project_id and version_info.get("version_id"):
-                            download_url = f"https://modrinth.com/mod/{project_id}/version/{version_info['version_id']}"
-                        elif provider == "curseforge" and version_info.get("file_id"):
-                            download_url = f"https://www.curseforge.com/minecraft/mc-mods/{project_id}/files/{version_info['file_id']}"
-                        # Final fallback using project_id and latest_version
-                        elif provider == "modrinth" and project_id:
-                            download_url = f"https://modrinth.com/mod/{project_id}/versions"
-                        elif provider == "curseforge" and project_id:
-                            download_url = f"https://www.curseforge.com/minecraft/mc-mods/{project_id}/files/all"
-                    
-                    # Write links section with clear formatting
-                    f.write("   === MOD LINKS ===\n")
-                    
-                    # Always write mod page URL (we should have at least a fallback)
-                    if mod_page_url:
-                        f.write(f"   MOD PAGE:   {mod_page_url}\n")
-                        f.write(f"   • View mod details, documentation, and issues\n")
-                    else:
-                        f.write(f"   MOD PAGE:   Not available for {provider}\n")
-                    
-                    # Prioritize direct .jar URL if available, otherwise use regular download URL
-                    if direct_jar_url:
-                        f.write(f"   DOWNLOAD:   {direct_jar_url}\n")
-                        f.write(f"   • Direct .jar download for version {latest_version}\n")
-                    elif download_url:
-                        f.write(f"   DOWNLOAD:   {download_url}\n")
-                        f.write(f"   • Use this URL to manually download version {latest_version}\n")
-                    else:
-                        f.write(f"   DOWNLOAD:   Not available for {provider}\n")
-                    
-                    # Add changelog URL if available
-                    if "changelog_url" in version_info:
-                        f.write(f"   Changelog: {version_info['changelog_url']}\n")
-                        
-                    if "date_published" in version_info:
-                        f.write(f"   Published: {version_info['date_published']}\n")
-                    
-                    # Additional mod info section
-                    f.write("   -----------------------------------------\n")
-                    
-                    f.write("\n")
-                    
-            self.logger.info(f"Update report written to {report_file}")
-            return report_file
-            
-        except IOError as e:
-            self.logger.error(f"Error writing update report: {str(e)}")
-            return None
-        except Exception as e:
-            self.logger.error(f"Unexpected error writing report: {str(e)}")
-            return None
-    
-    def interactive_download_menu(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """
-        Display an interactive menu for selecting mods to update.
-        
-        Args:
-            updates: List of update information dictionaries
-            
-        Returns:
-            List of selected updates
-        """
-        if not updates:
-            return []
-            
-        try:
-            tqdm.write("\n=== Available Mod Updates ===\n")
-            tqdm.write(f"Found {len(updates)} mods with available updates:\n")
-            
-            # Display updates in a more concise format
-            for i, update in enumerate(updates, 1):
-                mod_name = update["mod_name"]
-                current_version = update["current_version"]
-                latest_version = update["latest_version"]
-                
-                tqdm.write(f"{i}. {mod_name} [{current_version} → {latest_version}]")
-                
-            # Menu options
-            tqdm.write("\nOptions:")
-            tqdm.write("a - Download all updates")
-            tqdm.write("n - Download none (default if empty)")
-            tqdm.write("s - Select specific updates (comma-separated numbers)")
-            tqdm.write("Press Ctrl+C at any time to cancel")
-            
-            # Add a small delay before showing input prompt to make sure all output is displayed
-            import time
-            time.sleep(0.5)
-            
-            # Get user input
-            while True:
-                try:
-                    # Make the prompt more visible with a newline
-                    choice = input("\nEnter your choice: ").strip().lower()
-                    
-                    # Treat empty input as 'n'
-                    if not choice:
-                        tqdm.write("No updates selected (empty input)")
-                        return []
-                    
-                    if choice == 'a':
-                        tqdm.write(f"Selected all {len(updates)} updates for download")
-                        return updates
-                    elif choice == 'n':
-                        tqdm.write("No updates selected")
-                        return []
-                    elif choice == 's':
-                        # Get selection numbers
-                        while True:
-                            try:
-                                selection = input("Enter update numbers (comma-separated): ").strip()
-                                # Parse selection numbers
-                                if not selection:
-                                    tqdm.write("No updates selected")
-                                    return []
-                                    
-                                selected_indices = []
-                                for part in selection.split(','):
-                                    part = part.strip()
-                                    if not part:
-                                        continue
-                                        
-                                    num = int(part)
-                                    if 1 <= num <= len(updates):
-                                        selected_indices.append(num - 1)  # Convert to zero-based index
-                                    else:
-                                        raise ValueError(f"Invalid selection: {num}")
-                                        
-                                # Create list of selected updates
-                                selected_updates = [updates[i] for i in selected_indices]
-                                
-                                if not selected_updates:
-                                    tqdm.write("No updates selected")
-                                else:
-                                    tqdm.write(f"Selected {len(selected_updates)} updates for download")
-                                    
-                                return selected_updates
-                            
-                            except ValueError as e:
-                                tqdm.write(f"Invalid input: {str(e)}")
-                            except KeyboardInterrupt:
-                                # Handle Ctrl+C gracefully during selection
-                                tqdm.write("\nSelection cancelled. No updates selected.")
-                                return []
-                    else:
-                        tqdm.write("Invalid choice, please try again (a/n/s or empty for none)")
-                except KeyboardInterrupt:
-                    # Handle Ctrl+C gracefully during main menu
-                    tqdm.write("\nOperation cancelled. No updates selected.")
-                    return []
-        except Exception as e:
-            self.logger.error(f"Error in interactive menu: {str(e)}")
-            tqdm.write("\nError displaying interactive menu. No updates will be downloaded.")
-            return []
+"""
+Module for checking and updating Minecraft mods.
+
+This module provides the main functionality for scanning mod directories,
+checking for updates, and downloading newer versions.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import queue
+import datetime
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Set, Tuple
+from pathlib import Path
+from tqdm import tqdm
+
+# Worker threads for the network-bound per-mod update checks; outbound
+# concurrency is still capped by each provider's own request gate
+MAX_UPDATE_WORKERS = 8
+
+# Fallback worker count for concurrent mod downloads when the config
+# does not provide one; the providers' request gates keep either value
+# from spiking past API rate limits
+MAX_DOWNLOAD_WORKERS = 8
+
+# Deletes every ASCII character that is not alphanumeric, '_' or '-'
+# in a single C-level translate call
+_FILENAME_SANITIZE = str.maketrans(
+    '', '',
+    ''.join(chr(i) for i in range(128) if not (chr(i).isalnum() or chr(i) in '_-'))
+)
+
+# Fallback URL templates per provider for the update report, tried in
+# order; a template applies only when all of its named fields are set
+_PROVIDER_URL_TEMPLATES = {
+    "modrinth": {
+        "page": (
+            ("https://modrinth.com/mod/{project_id}", ("project_id",)),
+            ("https://modrinth.com/mod/{mod_id}", ("mod_id",)),
+        ),
+        "download": (
+            ("https://modrinth.com/mod/{project_id}/version/{version_id}", ("project_id", "version_id")),
+            ("https://modrinth.com/mod/{project_id}/versions", ("project_id",)),
+        ),
+    },
+    "curseforge": {
+        "page": (
+            ("https://www.curseforge.com/minecraft/mc-mods/{project_id}", ("project_id",)),
+            ("https://www.curseforge.com/minecraft/mc-mods/{slug}", ("slug",)),
+            ("https://www.curseforge.com/minecraft/mc-mods/{mod_id}", ("mod_id",)),
+        ),
+        "download": (
+            ("https://www.curseforge.com/minecraft/mc-mods/{project_id}/files/{file_id}", ("project_id", "file_id")),
+            ("https://www.curseforge.com/minecraft/mc-mods/{project_id}/files/all", ("project_id",)),
+        ),
+    },
+}
+
+
+def _build_provider_url(provider: str, kind: str, fields: Dict[str, Any]) -> Optional[str]:
+    """
+    Build a fallback URL from the provider template table.
+
+    Args:
+        provider: Provider name ('modrinth' or 'curseforge')
+        kind: Template kind ('page' or 'download')
+        fields: Candidate template fields (missing ones may be None)
+
+    Returns:
+        The first applicable URL, or None if no template matched
+    """
+    for template, required in _PROVIDER_URL_TEMPLATES.get(provider, {}).get(kind, ()):
+        if all(fields.get(name) for name in required):
+            return template.format(**fields)
+    return None
+
+
+def _extract_metadata(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract mod metadata in a worker process.
+
+    Module-level so it stays picklable for ProcessPoolExecutor; errors
+    are swallowed here and the path is re-attempted on the main thread
+    during the per-mod pass.
+
+    Args:
+        file_path: Path to the mod file
+
+    Returns:
+        Metadata dictionary, or None if extraction failed
+    """
+    try:
+        return get_mod_metadata(file_path)
+    except Exception:
+        return None
+
+
+class _BandwidthGate:
+    """
+    Admission gate that adapts download concurrency to a bandwidth budget.
+
+    Workers hold a permit while transferring and report their observed
+    throughput afterwards. When the active streams together would exceed
+    the configured budget, permits are withheld so fewer transfers run
+    at once; when headroom returns, the withheld permits are released.
+    """
+
+    # Recent per-stream throughput samples kept for the rolling estimate
+    _SAMPLE_WINDOW = 8
+
+    def __init__(self, budget_mbps: float, max_streams: int):
+        """
+        Initialize the gate.
+
+        Args:
+            budget_mbps: Aggregate download budget in Mbit/s
+            max_streams: Upper bound on concurrent transfers
+        """
+        self._budget_bytes = budget_mbps * 125_000  # Mbit/s -> bytes/s
+        self._max_streams = max(1, max_streams)
+        self._logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._samples: deque = deque(maxlen=self._SAMPLE_WINDOW)
+        self._semaphore = threading.Semaphore(self._max_streams)
+        self._withheld = 0
+
+    def __enter__(self) -> "_BandwidthGate":
+        self._semaphore.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self._semaphore.release()
+        return False
+
+    def record(self, num_bytes: int, seconds: float) -> None:
+        """
+        Report one finished transfer and re-derive the concurrency cap.
+
+        Args:
+            num_bytes: Bytes transferred
+            seconds: Wall time the transfer took
+        """
+        if num_bytes <= 0 or seconds <= 0:
+            return
+
+        with self._lock:
+            self._samples.append(num_bytes / seconds)
+            per_stream = sum(self._samples) / len(self._samples)
+
+            # Streams that together stay within the budget
+            cap = max(1, min(self._max_streams, int(self._budget_bytes / per_stream)))
+            target_withheld = self._max_streams - cap
+
+            # Shrink by taking permits out of circulation (never blocks:
+            # permits still held by workers just stay unavailable) and
+            # grow by putting withheld ones back
+            while self._withheld < target_withheld and self._semaphore.acquire(blocking=False):
+                self._withheld += 1
+            while self._withheld > target_withheld:
+                self._semaphore.release()
+                self._withheld -= 1
+
+            self._logger.debug(
+                f"Download concurrency cap now {self._max_streams - self._withheld} "
+                f"(per-stream ~{per_stream / 125_000:.1f} Mbit/s)"
+            )
+
+
+class TqdmLoggingHandler(logging.Handler):
+    """
+    Custom logging handler that writes messages using tqdm.write().
+    This prevents progress bars from being broken by log messages.
+    """
+    def emit(self, record):
+        try:
+            msg = self.format(record)
+            # Use tqdm.write which respects progress bars
+            tqdm.write(msg)
+            self.flush()
+        except Exception:
+            self.handleError(record)
+
+from data.api.modrinth import ModrinthProvider, BULK_HASH_LOOKUP_SIZE
+from data.api.curseforge import CurseForgeProvider
+from data.utils.file import (
+    get_mod_metadata,
+    find_mod_files,
+    ensure_directory,
+    download_file,
+    normalize_path,
+    compute_file_hash
+)
+from data.utils.version import compare_versions
+from data.config import Config
+from data.cache.manager import ModCache
+from data.__version__ import (
+    __version__,
+    __release_date__,
+    __author__,
+    __license__,
+    PACKAGE_NAME,
+    REPOSITORY_URL
+)
+
+
+class ModUpdateChecker:
+    """
+    Main class for checking and updating Minecraft mods.
+    
+    This class handles scanning mod directories, checking for updates,
+    and downloading updated mods.
+    """
+    
+    def __init__(
+        self,
+        config: Config,
+        cache: ModCache,
+        force_update: bool = False
+    ):
+        """
+        Initialize the mod update checker.
+        
+        Args:
+            config: Configuration object
+            cache: Cache manager object
+            force_update: Whether to force update checks, ignoring cache
+        """
+        self.config = config
+        self.cache = cache
+        self.force_update = force_update
+        self.logger = logging.getLogger(__name__)
+
+        # Serializes cache writes from the update-check worker threads
+        self._cache_lock = threading.Lock()
+
+        # Frozen for O(1) membership tests in the per-mod hot path
+        self._ignore_mods = frozenset(self.config.ignore_mods)
+
+        # Hoisted invariant config lookups; these are read once per mod
+        # in the hot paths and never change during a run
+        self._game_version = self.config.minecraft_version
+        self._mod_loader = self.config.get_normalized_mod_loader()
+        self._primary_provider = self.config.default_mod_provider
+        self._fallback_provider = self.config.fallback_mod_provider
+
+        # Stamp version-cache entries with everything that affects their
+        # validity; a mismatch (app upgrade, changed Minecraft version or
+        # loader) turns the stale entry into a miss
+        self._cache_version = f"{__version__}|{self._game_version}|{self._mod_loader}"
+        
+        # Initialize API providers
+        self.providers = {}
+        self._init_providers()
+        
+        # Configure logging for cleaner console output
+        self._configure_console_logging()
+        
+    def _configure_console_logging(self) -> None:
+        """Configure logging to reduce console clutter and preserve progress bars."""
+        # Get the root logger
+        root_logger = logging.getLogger()
+        
+        # Remove existing console handlers
+        for handler in list(root_logger.handlers):
+            if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+                root_logger.removeHandler(handler)
+        
+        # Add a new tqdm-compatible console handler
+        tqdm_handler = TqdmLoggingHandler()
+        tqdm_handler.setLevel(logging.ERROR)  # Only show ERROR and CRITICAL in console
+        compact_format = logging.Formatter('%(levelname)s: %(message)s')
+        tqdm_handler.setFormatter(compact_format)
+        root_logger.addHandler(tqdm_handler)
+    
+    def _init_providers(self) -> None:
+        """Initialize API providers based on configuration."""
+        # Initialize Modrinth provider (always available)
+        self.providers["modrinth"] = ModrinthProvider()
+        
+        # Initialize CurseForge provider if API key is available
+        if self.config.curseforge_api_key:
+            self.providers["curseforge"] = CurseForgeProvider(
+                api_key=self.config.curseforge_api_key
+            )
+        else:
+            self.logger.warning(
+                "CurseForge API key not set. CurseForge provider will not be available."
+            )
+
+        # Providers in preference order, deduplicated and limited to
+        # those actually initialized; the per-mod hot paths iterate
+        # this tuple instead of re-deriving the order every call
+        ordered = []
+        for name in (self._primary_provider, self._fallback_provider):
+            if name in self.providers and name not in ordered:
+                ordered.append(name)
+        self._ordered_providers = tuple(ordered)
+
+    def close(self) -> None:
+        """
+        Release provider resources.
+
+        Closes each provider's pooled HTTP session (persisting its
+        response cache) once the checker is no longer needed.
+        """
+        for name, provider in self.providers.items():
+            try:
+                provider.close()
+            except Exception as e:
+                self.logger.warning(f"Error closing {name} provider: {str(e)}")
+
+    def check_updates(self) -> List[Dict[str, Any]]:
+        """
+        Check for updates to mods.
+        
+        Returns:
+            List of dictionaries containing update information
+        """
+        # Validate mod directories
+        mod_dirs = self.config.validate_mod_directories()
+        if not mod_dirs:
+            self.logger.error("No valid mod directories found")
+            return []
+            
+        # Scan for mod files
+        mod_files = []
+        total_mods = 0
+        
+        # Create a scanning progress bar with status information
+        scan_bar = tqdm(
+            desc="📁 Scan", 
+            total=len(mod_dirs),
+            unit="dir", 
+            bar_format="{desc}: {percentage:3.0f}% |{bar}| {n_fmt}/{total_fmt}",
+            position=0,
+            leave=False,  # Don't leave the bar after completion
+            ncols=60,  # Further reduced width to prevent line wrapping
+            file=sys.stdout  # Explicitly set output to stdout
+        )
+        
+        try:
+            # Scan the directories in parallel; each scan is dominated
+            # by filesystem metadata calls, so they overlap well
+            with ThreadPoolExecutor(max_workers=len(mod_dirs)) as executor:
+                futures = {
+                    executor.submit(find_mod_files, mod_dir): mod_dir
+                    for mod_dir in mod_dirs
+                }
+
+                for future in as_completed(futures):
+                    mod_dir = futures[future]
+                    self.logger.debug(f"Scanned directory: {mod_dir}")
+                    try:
+                        found_files = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error scanning {mod_dir}: {str(e)}")
+                        found_files = []
+
+                    mod_files.extend(found_files)
+                    total_mods += len(found_files)
+
+                    # Only update the description when the mod count changes significantly (every 5 mods)
+                    if total_mods % 5 == 0 or total_mods == 1:
+                        scan_bar.set_description(f"📁 {total_mods}m")
+                    scan_bar.update(1)
+        finally:
+            # Make sure to clear the current line and close the bar properly
+            scan_bar.clear()
+            scan_bar.close()
+            print("", end="\r", flush=True)  # Ensure the line is cleared
+            print("", flush=True)  # Add a blank line after the progress bar
+            
+        # No mods found
+        if not mod_files:
+            self.logger.warning("No mod files found in configured directories")
+            tqdm.write("\nNo mod files found in the configured directories.")
+            print("", end="\r", flush=True)  # Ensure the line is cleared
+            return []
+            
+        # A run with the same configuration and an untouched mod set
+        # produces the same result; reuse the previous run's updates
+        # within the cache TTL instead of re-checking every mod
+        signature = self._updates_signature(mod_files)
+        if not self.force_update and signature:
+            cached_updates = self.cache.get_cached_updates(signature)
+            if cached_updates is not None:
+                self.logger.info(
+                    f"Reusing cached update results for {len(mod_files)} mods"
+                )
+                update_count = len(cached_updates)
+                if update_count > 0:
+                    tqdm.write(f"✅ Found {update_count} mod{'' if update_count == 1 else 's'} with available updates (cached)")
+                else:
+                    tqdm.write("✅ All mods are up to date (cached)")
+                return cached_updates
+
+        # Parse uncached jars across CPU cores, then resolve unknown
+        # project IDs and latest versions in bulk, so the per-mod loop
+        # can run almost entirely from cache
+        self._prefetch_mod_metadata(mod_files)
+        self._prefetch_project_ids(mod_files)
+        self._prefetch_latest_versions(mod_files)
+
+        # Find updates
+        updates = []
+        
+        # Create a processing progress bar with update counter
+        process_bar = tqdm(
+            total=len(mod_files),
+            desc=f"🔍 {total_mods}m",
+            unit="mod",
+            bar_format="{desc} [{n_fmt}/{total_fmt}] {percentage:3.0f}% |{bar}|",
+            position=0,
+            leave=True,  # Leave the final bar visible after completion
+            ncols=60,  # Further reduced width to prevent line wrapping
+            file=sys.stdout  # Explicitly set output to stdout
+        )
+
+        # Track the last update count to only update description when it changes
+        last_update_count = 0
+
+        try:
+            # Each check is network-bound, so fan the mods out over a
+            # thread pool; provider request gates cap real concurrency
+            max_workers = min(MAX_UPDATE_WORKERS, len(mod_files))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self._process_mod_file, file_path): file_path
+                    for file_path in mod_files
+                }
+
+                for future in as_completed(futures):
+                    file_path = futures[future]
+                    try:
+                        normalized_path, update_info = future.result()
+
+                        # If an update is available, add it to the list
+                        if update_info and update_info.get("update_available"):
+                            updates.append(update_info)
+                            # Only update the description when the update count changes
+                            if len(updates) != last_update_count:
+                                last_update_count = len(updates)
+                                process_bar.set_description(
+                                    f"🔍 {total_mods}m/{len(updates)}u"
+                                )
+                    except Exception as e:
+                        # Log error without breaking the progress bar
+                        process_bar.clear()  # Clear the current line
+                        self.logger.error(f"Error processing {file_path}: {str(e)}")
+                        # Resume the progress bar
+                        process_bar.refresh()
+
+                    process_bar.update(1)
+
+        finally:
+            # Make sure to clear and close the bar properly
+            process_bar.clear()
+            process_bar.close()
+            print("", end="\r", flush=True)  # Ensure the line is cleared
+            print("", flush=True)  # Add a blank line after the progress bar
+            
+        # Clean up cache against everything the scan saw; per-worker
+        # bookkeeping of processed paths is unnecessary
+        self.cache.clean_up({normalize_path(f) for f in mod_files})
+        if signature:
+            self.cache.set_cached_updates(signature, updates)
+        self.cache.save()
+        
+        # Print a summary of the update check
+        update_count = len(updates)
+        if update_count > 0:
+            tqdm.write(f"✅ Found {update_count} mod{'' if update_count == 1 else 's'} with available updates")
+        else:
+            tqdm.write("✅ All mods are up to date")
+        
+        return updates
+    
+    def _process_mod_file(self, file_path: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Run the full update check for one mod file.
+
+        Executed from the check_updates worker pool; cache writes inside
+        the helpers it calls are serialized by the cache lock.
+
+        Args:
+            file_path: Path to the mod file
+
+        Returns:
+            Tuple of (normalized path, update info or None)
+        """
+        normalized_path = normalize_path(file_path)
+
+        # Cheap filename pre-filter: an exact stem match lets ignored
+        # mods skip the ZIP open. Prefix matching is deliberately not
+        # attempted — ignoring "sodium" must not skip "sodium-extra" —
+        # so anything else falls through to the real mod_id check below
+        stem = os.path.splitext(os.path.basename(file_path))[0].lower()
+        if stem in self._ignore_mods:
+            self.logger.info(f"Skipping ignored mod file: {file_path}")
+            return normalized_path, None
+
+        # Extract metadata from the mod file
+        mod_metadata = self._get_mod_metadata(normalized_path)
+
+        # Skip files without a mod ID
+        if not mod_metadata["mod_id"]:
+            # Log this warning only to the file, not to console
+            self.logger.warning(f"Could not determine mod ID for {file_path}")
+            return normalized_path, None
+
+        # Skip ignored mods
+        if mod_metadata["mod_id"] in self._ignore_mods:
+            self.logger.info(f"Skipping ignored mod: {mod_metadata['mod_id']}")
+            return normalized_path, None
+
+        # Get project IDs from providers
+        project_ids = self._get_project_ids(mod_metadata)
+
+        # Check for updates from providers
+        update_info = self._check_for_update(mod_metadata, project_ids)
+
+        return normalized_path, update_info
+
+    def _metadata_is_current(self, cached_info: Dict[str, Any], file_path: str) -> bool:
+        """
+        Check whether cached metadata still matches the file on disk.
+
+        Args:
+            cached_info: Cached metadata dictionary
+            file_path: Path to the mod file
+
+        Returns:
+            True if the cached entry can be trusted
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            # Can't stat the file; fall back to trusting the cache
+            return True
+
+        return (
+            cached_info.get("file_size") == st.st_size
+            and cached_info.get("file_mtime") == int(st.st_mtime)
+        )
+
+    def _updates_signature(self, mod_files: List[str]) -> Optional[str]:
+        """
+        Build a signature for the current configuration and mod set.
+
+        The signature covers the cache version stamp (tool version, game
+        version and loader), the ignore list and provider order, plus
+        each mod file's path, size and mtime, so any change to the
+        configuration or the jars on disk produces a different value.
+
+        Args:
+            mod_files: List of mod file paths found by the scan
+
+        Returns:
+            Hex digest signature, or None if a mod file cannot be stated
+        """
+        digest = hashlib.sha256()
+        digest.update(self._cache_version.encode("utf-8"))
+        digest.update("|".join(sorted(self._ignore_mods)).encode("utf-8"))
+        digest.update("|".join(self._ordered_providers).encode("utf-8"))
+
+        for file_path in sorted(normalize_path(f) for f in mod_files):
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                # A file we cannot stat makes the run unrepeatable
+                return None
+            digest.update(f"{file_path}|{st.st_size}|{int(st.st_mtime)}".encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def _prefetch_mod_metadata(self, mod_files: List[str]) -> None:
+        """
+        Parse uncached jars in parallel worker processes.
+
+        Metadata extraction (ZIP decompress, manifest parse, hashing) is
+        CPU-bound, so on cold runs it is fanned out over a process pool
+        and the results are written into the cache; the subsequent
+        per-mod pass then reads metadata without touching the jars.
+
+        Args:
+            mod_files: List of mod file paths found by the scan
+        """
+        uncached = []
+        for file_path in mod_files:
+            normalized = normalize_path(file_path)
+            if self.force_update:
+                uncached.append(normalized)
+                continue
+
+            cached_info = self.cache.get_mod_file_info(normalized)
+            if not cached_info or not self._metadata_is_current(cached_info, normalized):
+                uncached.append(normalized)
+
+        # A single file is cheaper to parse in-process than to ship to
+        # a freshly spawned worker
+        if len(uncached) < 2:
+            return
+
+        # Freshly extracted metadata is fed through a bounded queue to a
+        # consumer thread that resolves Modrinth project IDs in bulk, so
+        # the network lookups overlap the remaining disk/CPU extraction
+        # instead of waiting for the whole batch
+        max_workers = min(os.cpu_count() or 1, len(uncached))
+        hash_queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=2 * max_workers)
+        consumer = threading.Thread(
+            target=self._resolve_hashes_from_queue, args=(hash_queue,), daemon=True
+        )
+        consumer.start()
+
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for path, metadata in zip(
+                    uncached, executor.map(_extract_metadata, uncached, chunksize=8)
+                ):
+                    if metadata is not None:
+                        with self._cache_lock:
+                            self.cache.set_mod_file_info(path, metadata)
+                        hash_queue.put(metadata)
+        except Exception as e:
+            # Not fatal: the per-mod pass parses whatever is missing
+            self.logger.warning(f"Parallel metadata extraction failed: {str(e)}")
+        finally:
+            hash_queue.put(None)
+            consumer.join()
+
+    def _resolve_hashes_from_queue(
+        self, hash_queue: "queue.Queue[Optional[Dict[str, Any]]]"
+    ) -> None:
+        """
+        Consume extracted metadata and resolve project IDs in batches.
+
+        Runs on its own thread alongside metadata extraction; hashes are
+        accumulated and sent through the bulk endpoint once a full chunk
+        is ready, with the remainder resolved after the sentinel.
+
+        Args:
+            hash_queue: Queue of metadata dicts, terminated by None
+        """
+        provider = self.providers.get("modrinth")
+
+        pending: Dict[str, str] = {}
+        while True:
+            metadata = hash_queue.get()
+            if metadata is None:
+                break
+            if provider is None:
+                continue
+
+            mod_id = metadata.get("mod_id")
+            file_hash = metadata.get("file_hash")
+            if not mod_id or not file_hash or mod_id in self._ignore_mods:
+                continue
+
+            # Already resolved on a previous run
+            if not self.force_update and self.cache.get_project_ids(mod_id).get("modrinth"):
+                continue
+
+            pending[file_hash] = mod_id
+            if len(pending) >= BULK_HASH_LOOKUP_SIZE:
+                self._resolve_project_id_batch(provider, pending)
+                pending = {}
+
+        if pending and provider is not None:
+            self._resolve_project_id_batch(provider, pending)
+
+    def _resolve_project_id_batch(
+        self, provider: ModrinthProvider, hash_to_mod: Dict[str, str]
+    ) -> None:
+        """
+        Resolve one batch of file hashes to project IDs into the cache.
+
+        Args:
+            provider: The Modrinth provider to query
+            hash_to_mod: Mapping of file hash to mod ID
+        """
+        try:
+            resolved = provider.get_project_ids_by_hashes(list(hash_to_mod))
+        except Exception as e:
+            self.logger.warning(f"Bulk project ID lookup failed: {str(e)}")
+            return
+
+        for file_hash, project_id in resolved.items():
+            if project_id:
+                with self._cache_lock:
+                    self.cache.set_project_ids(hash_to_mod[file_hash], modrinth_id=project_id)
+
+    def _prefetch_project_ids(self, mod_files: List[str]) -> None:
+        """
+        Resolve Modrinth project IDs for uncached mods in one batch.
+
+        Collects the SHA-1 hashes of every mod whose Modrinth ID is not
+        yet cached and resolves them through the bulk version_files
+        endpoint, turning N search round-trips into one request per
+        hash chunk.
+
+        Args:
+            mod_files: List of mod file paths found by the scan
+        """
+        provider = self.providers.get("modrinth")
+        if provider is None:
+            return
+
+        hash_to_mod: Dict[str, str] = {}
+        for file_path in mod_files:
+            try:
+                metadata = self._get_mod_metadata(normalize_path(file_path))
+            except Exception as e:
+                self.logger.warning(f"Error reading metadata from {file_path}: {str(e)}")
+                continue
+
+            mod_id = metadata.get("mod_id")
+            file_hash = metadata.get("file_hash")
+            if not mod_id or not file_hash or mod_id in self._ignore_mods:
+                continue
+
+            # Already resolved on a previous run
+            if not self.force_update and self.cache.get_project_ids(mod_id).get("modrinth"):
+                continue
+
+            hash_to_mod[file_hash] = mod_id
+
+        if not hash_to_mod:
+            return
+
+        self._resolve_project_id_batch(provider, hash_to_mod)
+
+    def _prefetch_latest_versions(self, mod_files: List[str]) -> None:
+        """
+        Fetch latest version info for uncached mods in one batch.
+
+        For every mod with a resolved Modrinth project ID but no valid
+        version-cache entry, the newest compatible version is fetched
+        through the bulk version_files/update endpoint and written into
+        the cache, so _get_latest_version answers from cache instead of
+        issuing one request per mod. CurseForge has no equivalent
+        filtered bulk endpoint and keeps its per-project query.
+
+        Args:
+            mod_files: List of mod file paths found by the scan
+        """
+        provider = self.providers.get("modrinth")
+        if provider is None:
+            return
+
+        game_version = self._game_version
+        mod_loader = self._mod_loader
+
+        hash_to_project: Dict[str, str] = {}
+        for file_path in mod_files:
+            try:
+                metadata = self._get_mod_metadata(normalize_path(file_path))
+            except Exception as e:
+                self.logger.warning(f"Error reading metadata from {file_path}: {str(e)}")
+                continue
+
+            mod_id = metadata.get("mod_id")
+            file_hash = metadata.get("file_hash")
+            if not mod_id or not file_hash or mod_id in self._ignore_mods:
+                continue
+
+            project_id = self.cache.get_project_ids(mod_id).get("modrinth")
+            if not project_id:
+                continue
+
+            # Already answered by a valid cache entry
+            if not self.force_update and self.cache.get_version_info(
+                "modrinth", project_id, game_version, mod_loader,
+                cache_version=self._cache_version
+            ):
+                continue
+
+            hash_to_project[file_hash] = project_id
+
+        if not hash_to_project:
+            return
+
+        resolved = provider.get_latest_versions_by_hashes(
+            list(hash_to_project), game_version, mod_loader
+        )
+        for file_hash, version_info in resolved.items():
+            with self._cache_lock:
+                self.cache.set_version_info(
+                    "modrinth", hash_to_project[file_hash],
+                    game_version, mod_loader, version_info,
+                    cache_version=self._cache_version
+                )
+
+    def _get_mod_metadata(self, file_path: str) -> Dict[str, Any]:
+        """
+        Get metadata for a mod file, either from cache or by parsing the file.
+        
+        Args:
+            file_path: Path to the mod file
+            
+        Returns:
+            Dictionary containing mod metadata
+        """
+        # Check if we have cached metadata
+        cached_info = None
+        if not self.force_update:
+            cached_info = self.cache.get_mod_file_info(file_path)
+
+        if cached_info:
+            # Trust the cache only while the file on disk is unchanged;
+            # a replaced jar with the same name re-parses automatically
+            if self._metadata_is_current(cached_info, file_path):
+                self.logger.debug(f"Using cached metadata for {file_path}")
+                return cached_info
+
+            self.logger.debug(f"Cached metadata for {file_path} is stale, re-parsing")
+
+
+        # Extract metadata from the file
+        self.logger.debug(f"Extracting metadata from {file_path}")
+        metadata = get_mod_metadata(file_path)
+        
+        # Store in cache for future use
+        with self._cache_lock:
+            self.cache.set_mod_file_info(file_path, metadata)
+        
+        return metadata
+    
+    def _get_project_ids(self, mod_metadata: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """
+        Get project IDs for a mod from various providers.
+        
+        Args:
+            mod_metadata: Mod metadata dictionary
+            
+        Returns:
+            Dictionary with provider names as keys and project IDs as values
+        """
+        mod_id = mod_metadata["mod_id"]
+        
+        # Check cache first
+        cached_ids = self.cache.get_project_ids(mod_id)
+        if not self.force_update and all(cached_ids.values()):
+            return cached_ids
+
+        # Query providers for missing IDs in preference order
+        updated_ids = {}
+        for provider_name in self._ordered_providers:
+            if not cached_ids.get(provider_name):
+                updated_ids[provider_name] = self.providers[provider_name].get_project_id(mod_id)
+
+        # Warm path: nothing new, hand back the cached dict untouched
+        if not updated_ids:
+            return cached_ids
+
+        with self._cache_lock:
+            self.cache.set_project_ids(
+                mod_id,
+                modrinth_id=updated_ids.get("modrinth", cached_ids.get("modrinth")),
+                curseforge_id=updated_ids.get("curseforge", cached_ids.get("curseforge"))
+            )
+
+        # The cache hands back its own dict, so merge into a copy
+        result = dict(cached_ids)
+        result.update({k: v for k, v in updated_ids.items() if v is not None})
+
+        return result
+    
+    def _check_for_update(
+        self, 
+        mod_metadata: Dict[str, Any], 
+        project_ids: Dict[str, Optional[str]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Check if an update is available for a mod.
+        
+        Args:
+            mod_metadata: Mod metadata dictionary
+            project_ids: Dictionary of project IDs by provider
+            
+        Returns:
+            Update information dictionary or None if no update available
+        """
+        mod_id = mod_metadata["mod_id"]
+        current_version = mod_metadata.get("version")
+        
+        if not current_version:
+            self.logger.warning(f"Could not determine current version for {mod_id}")
+            return None
+            
+        self.logger.debug(f"Checking updates for {mod_id} (current: {current_version})")
+        
+        # Get the latest version from providers
+        latest_version_info = self._get_latest_version(
+            project_ids, self._game_version, self._mod_loader
+        )
+        
+        if not latest_version_info:
+            self.logger.info(f"No update information found for {mod_id}")
+            return None
+            
+        latest_version = latest_version_info.get("version_number")
+        if not latest_version:
+            self.logger.warning(f"No version number in update info for {mod_id}")
+            return None
+            
+        # Check if update is available
+        update_available = compare_versions(current_version, latest_version)
+        
+        if update_available:
+            self.logger.debug(f"Update available for {mod_id}: {current_version} -> {latest_version}")
+        else:
+            self.logger.debug(f"No update needed for {mod_id} (current: {current_version}, latest: {latest_version})")
+            
+        # Prepare update information
+        update_info = {
+            "mod_id": mod_id,
+            "mod_name": mod_metadata.get("mod_name", mod_id),
+            "current_file": mod_metadata.get("file_name", ""),
+            "current_version": current_version,
+            "latest_version": latest_version,
+            "update_available": update_available,
+            "version_info": latest_version_info,
+            "provider": latest_version_info.get("provider"),
+            "metadata": mod_metadata
+        }
+        
+        return update_info
+    
+    def _get_latest_version(
+        self,
+        project_ids: Dict[str, Optional[str]],
+        game_version: str,
+        mod_loader: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest version information for a mod.
+        
+        Args:
+            project_ids: Dictionary of project IDs by provider
+            game_version: Minecraft version to filter by
+            mod_loader: Mod loader to filter by
+            
+        Returns:
+            Dictionary containing version information or None if not found
+        """
+        # Serve from cache first; _ordered_providers is already in
+        # preference order, so the first cached hit is the answer
+        if not self.force_update:
+            for provider_name in self._ordered_providers:
+                project_id = project_ids.get(provider_name)
+                if not project_id:
+                    continue
+
+                cached_info = self.cache.get_version_info(
+                    provider_name, project_id, game_version, mod_loader,
+                    cache_version=self._cache_version
+                )
+                if cached_info:
+                    return cached_info
+
+        # Otherwise query providers in preference order, returning the
+        # first hit; with one configured provider (the common case when
+        # no CurseForge key is set) this is a single direct call
+        for provider_name in self._ordered_providers:
+            project_id = project_ids.get(provider_name)
+            if not project_id:
+                continue
+
+            version_info = self.providers[provider_name].get_latest_version(
+                project_id, game_version, mod_loader
+            )
+
+            if version_info:
+                # Store in cache
+                with self._cache_lock:
+                    self.cache.set_version_info(
+                        provider_name, project_id, game_version, mod_loader, version_info,
+                        cache_version=self._cache_version
+                    )
+                return version_info
+
+        return None
+    
+    def download_updates(
+        self, 
+        updates: List[Dict[str, Any]], 
+        dry_run: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Download updates for mods.
+        
+        Args:
+            updates: List of update information dictionaries
+            dry_run: If True, only simulate downloads
+            
+        Returns:
+            List of successfully downloaded updates
+        """
+        if not updates:
+            return []
+            
+        # Ensure download directory exists
+        download_dir = self.config.get_absolute_download_directory()
+        if not dry_run and not self.config.create_download_directory():
+            self.logger.error(f"Failed to create download directory: {download_dir}")
+            return []
+            
+        successful_downloads = []
+
+        tqdm.write(f"Downloading {len(updates)} mod updates...")
+
+        # Create download progress bar
+        download_bar = tqdm(
+            total=len(updates),
+            desc="⬇️ DL",
+            unit="mod",
+            position=0,
+            leave=True,  # Leave the bar visible after completion
+            bar_format="{desc}: {percentage:3.0f}% |{bar}| {n_fmt}/{total_fmt}",
+            ncols=60,  # Further reduced width to prevent line wrapping
+            file=sys.stdout  # Explicitly set output to stdout
+        )
+
+        try:
+            # Downloads are bandwidth-bound, so run several at once;
+            # per-provider request gates keep rate limits respected
+            configured = getattr(self.config, "concurrent_downloads", MAX_DOWNLOAD_WORKERS)
+            max_workers = min(configured or MAX_DOWNLOAD_WORKERS, len(updates))
+
+            # Gate transfers against the configured bandwidth budget so a
+            # slow link is not saturated by the full worker count
+            budget = getattr(self.config, "max_download_bandwidth_mbps", 0)
+            gate = _BandwidthGate(budget, max_workers) if budget and not dry_run else None
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self._download_one, update, download_dir, dry_run, gate): update
+                    for update in updates
+                }
+
+                for future in as_completed(futures):
+                    update = futures[future]
+                    try:
+                        success = future.result()
+                    except Exception as e:
+                        download_bar.clear()  # Clear the current line
+                        self.logger.error(
+                            f"Error downloading {update['mod_id']} "
+                            f"v{update['latest_version']}: {str(e)}"
+                        )
+                        download_bar.refresh()  # Resume the progress bar
+                        success = False
+
+                    if success:
+                        successful_downloads.append(update)
+                    else:
+                        # Log error without breaking the progress bar
+                        download_bar.clear()  # Clear the current line
+                        self.logger.error(
+                            f"Failed to download {update['mod_id']} v{update['latest_version']}"
+                        )
+                        download_bar.refresh()  # Resume the progress bar
+
+                    download_bar.update(1)
+
+        finally:
+            # Make sure to clear and close the bar properly
+            download_bar.clear()
+            download_bar.close()
+            print("", end="\r", flush=True)  # Ensure the line is cleared
+            print("", flush=True)  # Add a blank line after the progress bar
+
+        return successful_downloads
+
+    def _download_one(
+        self,
+        update: Dict[str, Any],
+        download_dir: str,
+        dry_run: bool,
+        gate: Optional[_BandwidthGate] = None
+    ) -> bool:
+        """
+        Download a single mod update.
+
+        Executed from the download_updates worker pool.
+
+        Args:
+            update: Update information dictionary
+            download_dir: Directory to download into
+            dry_run: If True, only simulate the download
+            gate: Optional bandwidth gate limiting concurrent transfers
+
+        Returns:
+            True if the download succeeded (or was simulated)
+        """
+        mod_id = update["mod_id"]
+        mod_name = update["mod_name"]
+        provider = update["provider"]
+        version_info = update["version_info"]
+        latest_version = update["latest_version"]
+
+        if provider not in self.providers:
+            self.logger.error(f"Provider {provider} not available for {mod_id}")
+            return False
+
+        # Generate output filename
+        output_filename = self._generate_output_filename(mod_id, mod_name, latest_version)
+        output_path = os.path.join(download_dir, output_filename)
+
+        self.logger.debug(f"Downloading {mod_id} v{latest_version} to {output_path}")
+
+        if dry_run:
+            self.logger.info(f"[DRY RUN] Would download {mod_id} v{latest_version}")
+            return True
+
+        # A previous (possibly interrupted) run may already have left
+        # the exact file on disk; verify by hash and skip the download
+        if self._already_downloaded(update, output_path):
+            self.logger.info(f"Skipping {mod_id} v{latest_version}: already downloaded")
+            return True
+
+        # Perform the download, reporting throughput to the bandwidth
+        # gate so it can adapt the concurrency cap
+        if gate is None:
+            success = self.providers[provider].download_mod(version_info, output_path)
+        else:
+            with gate:
+                started = time.monotonic()
+                success = self.providers[provider].download_mod(version_info, output_path)
+                elapsed = time.monotonic() - started
+            if success:
+                try:
+                    gate.record(os.path.getsize(output_path), elapsed)
+                except OSError:
+                    pass
+
+        if success:
+            self.logger.debug(f"Successfully downloaded {mod_id} v{latest_version}")
+            sha1 = compute_file_hash(output_path)
+            if sha1:
+                with self._cache_lock:
+                    self.cache.set_download_info(
+                        mod_name, latest_version,
+                        {"path": output_path, "sha1": sha1}
+                    )
+
+        return success
+
+    def _already_downloaded(self, update: Dict[str, Any], output_path: str) -> bool:
+        """
+        Check whether the update is already present at the destination.
+
+        Compares the existing file's SHA-1 against the hash the provider
+        advertises for the version; the hash of a verified download is
+        remembered in the cache so reruns don't even re-hash the file.
+
+        Args:
+            update: Update information dictionary
+            output_path: Destination path for the download
+
+        Returns:
+            True if a matching file already exists
+        """
+        if not os.path.exists(output_path):
+            return False
+
+        version_info = update["version_info"]
+        files = version_info.get("files") or []
+        expected_sha1 = (files[0].get("hashes") or {}).get("sha1") if files else None
+        if not expected_sha1:
+            return False
+
+        cached = self.cache.get_download_info(update["mod_name"], update["latest_version"])
+        if cached and cached.get("path") == output_path and cached.get("sha1") == expected_sha1:
+            return True
+
+        actual_sha1 = compute_file_hash(output_path)
+        if actual_sha1 != expected_sha1:
+            return False
+
+        with self._cache_lock:
+            self.cache.set_download_info(
+                update["mod_name"], update["latest_version"],
+                {"path": output_path, "sha1": actual_sha1}
+            )
+        return True
+    
+    def _generate_output_filename(
+        self, 
+        mod_id: str, 
+        mod_name: str, 
+        version: str
+    ) -> str:
+        """
+        Generate an output filename for a downloaded mod.
+        
+        Args:
+            mod_id: Mod ID
+            mod_name: Mod name
+            version: Version string
+            
+        Returns:
+            Output filename
+        """
+        # Use mod name if available, fallback to mod ID
+        base_name = mod_name.replace(" ", "_") if mod_name else mod_id
+        
+        # Sanitize filename; ASCII names (the common case) go through
+        # one translate call, anything else keeps the per-char filter
+        if base_name.isascii():
+            base_name = base_name.translate(_FILENAME_SANITIZE)
+        else:
+            base_name = "".join(c for c in base_name if c.isalnum() or c in "_-")
+        
+        # Create filename with version
+        filename = f"{base_name}-{version}.jar"
+        
+        return filename
+        
+    def write_update_report(self, updates: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Write a report of available updates to a file.
+        
+        Args:
+            updates: List of update information dictionaries
+            
+        Returns:
+            Path to the report file or None if writing failed
+        """
+        if not updates:
+            self.logger.info("No updates to report")
+            return None
+            
+        try:
+            # Create reports directory if needed
+            report_dir = os.path.join(os.path.dirname(self.config.config_file), "reports")
+            if not ensure_directory(report_dir):
+                self.logger.error(f"Failed to create reports directory: {report_dir}")
+                return None
+                
+            # Generate report filename with timestamp
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            report_file = os.path.join(report_dir, f"update_report_{timestamp}.txt")
+            
+            # Build the report in memory and flush it with one write;
+            # per-line f.write calls add up on large update lists
+            parts = [
+                f"=== {PACKAGE_NAME} Mod Update Report ===\n",
+                f"{PACKAGE_NAME} Version: {__version__} (Released: {__release_date__})\n",
+                f"Report Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+                f"Minecraft Version: {self.config.minecraft_version}\n",
+                f"Mod Loader: {self.config.mod_loader}\n",
+                f"Repository: {REPOSITORY_URL}\n",
+                f"License: {__license__}\n",
+                "\n",
+                f"Found {len(updates)} mods with available updates:\n\n",
+            ]
+
+            for i, update in enumerate(updates, 1):
+                mod_id = update["mod_id"]
+                mod_name = update["mod_name"]
+                current_version = update["current_version"]
+                latest_version = update["latest_version"]
+                provider = update["provider"]
+                version_info = update.get("version_info", {})
+                
+                parts.append(f"{i}. {mod_name} ({mod_id})\n")
+                parts.append(f"   Current Version: {current_version}\n")
+                parts.append(f"   Latest Version: {latest_version}\n")
+                parts.append(f"   Provider: {provider}\n")
+                
+                # Get and write mod page URL with fallbacks
+                mod_page_url = version_info.get("mod_page_url")
+                project_id = version_info.get("project_id")
+
+                # Fields the provider URL templates can draw on
+                url_fields = {
+                    "mod_id": mod_id,
+                    "project_id": project_id,
+                    "slug": version_info.get("slug"),
+                    "version_id": version_info.get("version_id"),
+                    "file_id": version_info.get("file_id"),
+                }
+
+                # Provider-specific fallback URLs for mod page
+                if not mod_page_url:
+                    mod_page_url = _build_provider_url(provider, "page", url_fields)
+
+                # Get download URL with comprehensive fallbacks
+                download_url = None
+                direct_jar_url = None
+                
+                # Try to get URL from files array first (most reliable)
+                if "files" in version_info and version_info["files"]:
+                    # First try to find a direct .jar URL
+                    for file_info in version_info["files"]:
+                        if "download_url" in file_info and file_info["download_url"].lower().endswith('.jar'):
+                            direct_jar_url = file_info["download_url"]
+                            download_url = direct_jar_url
+                            break
+                    
+                    # If no direct .jar URL found, use the first available download URL
+                    if not download_url:
+                        for file_info in version_info["files"]:
+                            if "download_url" in file_info:
+                                download_url = file_info["download_url"]
+                                break
+                
+                # Fall back to direct download_url if available
+                if not download_url and "download_url" in version_info:
+                    download_url = version_info["download_url"]
+                    # Check if this is a direct .jar URL
+                    if download_url and download_url.lower().endswith('.jar'):
+                        direct_jar_url = download_url
+                
+                # Provider-specific fallback download URLs
+                if not download_url:
+                    download_url = _build_provider_url(provider, "download", url_fields)
+
+                # Write links section with clear formatting
+                parts.append("   === MOD LINKS ===\n")
+                
+                # Always write mod page URL (we should have at least a fallback)
+                if mod_page_url:
+                    parts.append(f"   MOD PAGE:   {mod_page_url}\n")
+                    parts.append(f"   • View mod details, documentation, and issues\n")
+                else:
+                    parts.append(f"   MOD PAGE:   Not available for {provider}\n")
+                
+                # Prioritize direct .jar URL if available, otherwise use regular download URL
+                if direct_jar_url:
+                    parts.append(f"   DOWNLOAD:   {direct_jar_url}\n")
+                    parts.append(f"   • Direct .jar download for version {latest_version}\n")
+                elif download_url:
+                    parts.append(f"   DOWNLOAD:   {download_url}\n")
+                    parts.append(f"   • Use this URL to manually download version {latest_version}\n")
+                else:
+                    parts.append(f"   DOWNLOAD:   Not available for {provider}\n")
+                
+                # Add changelog URL if available
+                if "changelog_url" in version_info:
+                    parts.append(f"   Changelog: {version_info['changelog_url']}\n")
+                    
+                if "date_published" in version_info:
+                    parts.append(f"   Published: {version_info['date_published']}\n")
+                
+                # Additional mod info section
+                parts.append("   -----------------------------------------\n")
+                
+                parts.append("\n")
+                
+            with open(report_file, 'w', encoding='utf-8') as f:
+                f.write("".join(parts))
+
+            self.logger.info(f"Update report written to {report_file}")
+            return report_file
+            
+        except IOError as e:
+            self.logger.error(f"Error writing update report: {str(e)}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Unexpected error writing report: {str(e)}")
+            return None
+    
+    def interactive_download_menu(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Display an interactive menu for selecting mods to update.
+        
+        Args:
+            updates: List of update information dictionaries
+            
+        Returns:
+            List of selected updates
+        """
+        if not updates:
+            return []
+            
+        try:
+            tqdm.write("\n=== Available Mod Updates ===\n")
+            tqdm.write(f"Found {len(updates)} mods with available updates:\n")
+            
+            # Display updates in a more concise format
+            for i, update in enumerate(updates, 1):
+                mod_name = update["mod_name"]
+                current_version = update["current_version"]
+                latest_version = update["latest_version"]
+                
+                tqdm.write(f"{i}. {mod_name} [{current_version} → {latest_version}]")
+                
+            # Menu options
+            tqdm.write("\nOptions:")
+            tqdm.write("a - Download all updates")
+            tqdm.write("n - Download none (default if empty)")
+            tqdm.write("s - Select specific updates (comma-separated numbers)")
+            tqdm.write("Press Ctrl+C at any time to cancel")
+            
+            # Add a small delay before showing input prompt to make sure all output is displayed
+            import time
+            time.sleep(0.5)
+            
+            # Get user input
+            while True:
+                try:
+                    # Make the prompt more visible with a newline
+                    choice = input("\nEnter your choice: ").strip().lower()
+                    
+                    # Treat empty input as 'n'
+                    if not choice:
+                        tqdm.write("No updates selected (empty input)")
+                        return []
+                    
+                    if choice == 'a':
+                        tqdm.write(f"Selected all {len(updates)} updates for download")
+                        return updates
+                    elif choice == 'n':
+                        tqdm.write("No updates selected")
+                        return []
+                    elif choice == 's':
+                        # Get selection numbers
+                        while True:
+                            try:
+                                selection = input("Enter update numbers (comma-separated): ").strip()
+                                # Parse selection numbers
+                                if not selection:
+                                    tqdm.write("No updates selected")
+                                    return []
+                                    
+                                selected_indices = []
+                                for part in selection.split(','):
+                                    part = part.strip()
+                                    if not part:
+                                        continue
+                                        
+                                    num = int(part)
+                                    if 1 <= num <= len(updates):
+                                        selected_indices.append(num - 1)  # Convert to zero-based index
+                                    else:
+                                        raise ValueError(f"Invalid selection: {num}")
+                                        
+                                # Create list of selected updates
+                                selected_updates = [updates[i] for i in selected_indices]
+                                
+                                if not selected_updates:
+                                    tqdm.write("No updates selected")
+                                else:
+                                    tqdm.write(f"Selected {len(selected_updates)} updates for download")
+                                    
+                                return selected_updates
+                            
+                            except ValueError as e:
+                                tqdm.write(f"Invalid input: {str(e)}")
+                            except KeyboardInterrupt:
+                                # Handle Ctrl+C gracefully during selection
+                                tqdm.write("\nSelection cancelled. No updates selected.")
+                                return []
+                    else:
+                        tqdm.write("Invalid choice, please try again (a/n/s or empty for none)")
+                except KeyboardInterrupt:
+                    # Handle Ctrl+C gracefully during main menu
+                    tqdm.write("\nOperation cancelled. No updates selected.")
+                    return []
+        except Exception as e:
+            self.logger.error(f"Error in interactive menu: {str(e)}")
+            tqdm.write("\nError displaying interactive menu. No updates will be downloaded.")
+            return []
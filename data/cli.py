@@ -6,12 +6,12 @@ import os
 import sys
 import argparse
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 
-from data.config import Config
-from data.cache.manager import ModCache
-from data.checker import ModUpdateChecker
-from data.utils.logging import setup_logging, get_logger
+# The checker stack (Config, ModCache, ModUpdateChecker, logging setup)
+# is imported inside run() so the --version fast path pays only for
+# interpreter startup, not the transitive requests/tqdm imports
 from data.__version__ import (
     __version__,
     __author__,
@@ -44,12 +44,17 @@ def display_version_info(verbose: bool = False) -> None:
         print(f"  Repository: {REPOSITORY_URL}")
 
 
-def parse_args() -> argparse.Namespace:
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
     """
-    Parse command-line arguments.
-    
+    Build the command-line parser.
+
+    Constructed lazily and cached: add_argument calls are not free, and
+    repeated run() invocations in one process (tests, library use) can
+    share the same parser.
+
     Returns:
-        Parsed arguments
+        Configured argument parser
     """
     parser = argparse.ArgumentParser(
         description=f"{PACKAGE_NAME} v{__version__} - Check Minecraft mods for updates",
@@ -77,19 +82,29 @@ def parse_args() -> argparse.Namespace:
         default="config.json", 
         help="Path to configuration file (default: config.json)"
     )
-    parser.add_argument(
-        "--no-interaction", 
-        action="store_true", 
+    # The download modes contradict each other; letting argparse enforce
+    # that keeps run() to a plain three-way branch
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--no-interaction",
+        action="store_true",
         help="Run without interactive prompts, skipping downloads"
     )
-    parser.add_argument(
-        "--download-all", 
-        action="store_true", 
+    mode.add_argument(
+        "--download-all",
+        action="store_true",
         help="Automatically download all available updates without prompting"
     )
     parser.add_argument(
-        "--version", 
-        action="store_true", 
+        "--parallelism",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of mods to download in parallel (overrides config)"
+    )
+    parser.add_argument(
+        "--version",
+        action="store_true",
         help="Display version information and exit"
     )
     parser.add_argument(
@@ -97,8 +112,18 @@ def parse_args() -> argparse.Namespace:
         action="store_true", 
         help="Display detailed version information and exit"
     )
-    
-    return parser.parse_args()
+
+    return parser
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Returns:
+        Parsed arguments
+    """
+    return _build_parser().parse_args()
 
 
 def run() -> int:
@@ -108,14 +133,26 @@ def run() -> int:
     Returns:
         Exit code (0 for success, non-zero for failure)
     """
+    # Fast path: version display needs nothing beyond the metadata
+    # already imported, so skip argparse and the heavy imports entirely
+    if "--version" in sys.argv[1:] or "--version-verbose" in sys.argv[1:]:
+        display_version_info(verbose="--version-verbose" in sys.argv[1:])
+        return 0
+
     # Parse command-line arguments
     args = parse_args()
-    
+
     # Check if version display is requested
     if args.version or args.version_verbose:
         display_version_info(verbose=args.version_verbose)
         return 0
-    
+
+    # Deferred imports of the checker stack (see module header)
+    from data.config import Config
+    from data.cache.manager import ModCache
+    from data.checker import ModUpdateChecker
+    from data.utils.logging import setup_logging, get_logger
+
     # Setup logging
     setup_logging(debug_mode=args.debug)
     
@@ -135,7 +172,12 @@ def run() -> int:
         if not config:
             logger.error("Failed to load configuration")
             return 1
-            
+
+        # Command-line parallelism overrides the configured value
+        if args.parallelism is not None:
+            config.concurrent_downloads = max(1, args.parallelism)
+
+
         # Initialize cache
         cache = ModCache.load()
         
@@ -146,36 +188,42 @@ def run() -> int:
             force_update=args.force
         )
         
-        # Check for updates
-        logger.info("Checking for updates...")
-        updates = checker.check_updates()
-        
-        # Display results
-        if updates:
-            print(f"\nCheck complete: Found {len(updates)} mods with available updates")
-            
-            # Generate update report
-            report_file = checker.write_update_report(updates)
-            if report_file:
-                print(f"Detailed report saved to: {report_file}")
-            
-            # Handle downloads
-            if args.no_interaction:
-                logger.info("Skipping downloads (--no-interaction specified)")
-            elif args.download_all:
-                logger.info("Automatically downloading all updates (--download-all specified)")
-                checker.download_updates(updates, dry_run=args.dry_run)
-            else:
-                # Interactive download menu
-                selected_updates = checker.interactive_download_menu(updates)
-                if selected_updates:
-                    checker.download_updates(selected_updates, dry_run=args.dry_run)
+        try:
+            # Check for updates; the checker parallelizes internally,
+            # and nothing useful happens between here and needing the
+            # result, so a pre-warm thread would buy no overlap
+            logger.info("Checking for updates...")
+            updates = checker.check_updates()
+
+            # Display results
+            if updates:
+                print(f"\nCheck complete: Found {len(updates)} mods with available updates")
+
+                # Generate update report
+                report_file = checker.write_update_report(updates)
+                if report_file:
+                    print(f"Detailed report saved to: {report_file}")
+
+                # Handle downloads
+                if args.no_interaction:
+                    logger.info("Skipping downloads (--no-interaction specified)")
+                elif args.download_all:
+                    logger.info("Automatically downloading all updates (--download-all specified)")
+                    checker.download_updates(updates, dry_run=args.dry_run)
                 else:
-                    logger.info("No updates selected for download")
-        else:
-            print("\nCheck complete: All mods are up to date!")
-        
-        return 0
+                    # Interactive download menu
+                    selected_updates = checker.interactive_download_menu(updates)
+                    if selected_updates:
+                        checker.download_updates(selected_updates, dry_run=args.dry_run)
+                    else:
+                        logger.info("No updates selected for download")
+            else:
+                print("\nCheck complete: All mods are up to date!")
+
+            return 0
+        finally:
+            # Release pooled provider connections
+            checker.close()
     except KeyboardInterrupt:
         logger.info("Operation cancelled by user")
         return 130  # Standard exit code for SIGINT
@@ -4,13 +4,59 @@ Configuration management for mod update checker.
 
 import os
 import json
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
+# orjson parses and serializes JSON several times faster than the
+# stdlib; fall back to json if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parsed configs memoized by (absolute path, mtime); a changed file
+# gets a new mtime and therefore a fresh parse
+_CONFIG_CACHE: Dict[Tuple[str, float], "Config"] = {}
+
+# Loaders the providers understand; frozenset membership avoids
+# rebuilding a list on every normalization call
+_VALID_LOADERS = frozenset({"fabric", "forge", "quilt"})
+
+
+@lru_cache(maxsize=256)
+def _resolve_dir(path: str) -> Optional[str]:
+    """
+    Resolve a configured mod directory to its absolute path.
+
+    Memoized because the same handful of directories is validated on
+    every check; a directory created or removed mid-process is picked
+    up after the next config save clears the cache.
+
+    Args:
+        path: Directory path as configured
+
+    Returns:
+        Absolute path if the directory exists, None otherwise
+    """
+    abs_path = os.path.abspath(path)
+    return abs_path if os.path.isdir(abs_path) else None
 
 
 class Config:
     """Configuration manager for mod update checker."""
-    
+
+    # Fixed attribute layout, mirroring ModCache: no per-instance
+    # __dict__ and direct slot descriptors for attribute access
+    __slots__ = (
+        "config_file", "mod_directories", "minecraft_version", "mod_loader",
+        "download_directory", "ignore_mods", "default_mod_provider",
+        "fallback_mod_provider", "curseforge_api_key", "concurrent_downloads",
+        "max_download_bandwidth_mbps", "_last_saved_hash", "_normalized_loader"
+    )
+
     DEFAULT_CONFIG_FILE = "config.json"
     
     DEFAULT_CONFIG = {
@@ -21,7 +67,9 @@ class Config:
         "ignore_mods": [],
         "default_mod_provider": "modrinth",
         "fallback_mod_provider": "curseforge",
-        "curseforge_api_key": ""
+        "curseforge_api_key": "",
+        "concurrent_downloads": 8,
+        "max_download_bandwidth_mbps": 200
     }
     
     def __init__(
@@ -34,7 +82,9 @@ class Config:
         ignore_mods: Optional[List[str]] = None,
         default_mod_provider: str = "modrinth",
         fallback_mod_provider: str = "curseforge",
-        curseforge_api_key: str = ""
+        curseforge_api_key: str = "",
+        concurrent_downloads: int = 8,
+        max_download_bandwidth_mbps: float = 200
     ):
         """
         Initialize configuration.
@@ -49,6 +99,8 @@ class Config:
             default_mod_provider: Primary mod provider (modrinth, curseforge)
             fallback_mod_provider: Secondary mod provider
             curseforge_api_key: API key for CurseForge
+            concurrent_downloads: Number of mods to download in parallel
+            max_download_bandwidth_mbps: Download bandwidth budget in Mbit/s
         """
         self.config_file = config_file
         self.mod_directories = mod_directories or self.DEFAULT_CONFIG["mod_directories"]
@@ -59,7 +111,17 @@ class Config:
         self.default_mod_provider = default_mod_provider
         self.fallback_mod_provider = fallback_mod_provider
         self.curseforge_api_key = curseforge_api_key
-    
+        self.concurrent_downloads = concurrent_downloads
+        self.max_download_bandwidth_mbps = max_download_bandwidth_mbps
+
+        # Hash of the content last written to disk; save() skips the
+        # write entirely when nothing has changed since
+        self._last_saved_hash: Optional[str] = None
+
+        # Memoized (raw, normalized) loader pair; recomputed only when
+        # mod_loader itself changes
+        self._normalized_loader: Optional[Tuple[str, str]] = None
+
     @classmethod
     def load(cls, config_file: str = DEFAULT_CONFIG_FILE) -> 'Config':
         """
@@ -67,33 +129,53 @@ class Config:
         
         Args:
             config_file: Path to configuration file
-            
+
         Returns:
             Config instance with loaded data or defaults
+
+        Repeated loads of an unchanged file return the same cached
+        instance, keyed by absolute path and mtime; saving through this
+        class or editing the file on disk both invalidate the entry.
         """
-        default_config = cls.DEFAULT_CONFIG.copy()
-        
         try:
             if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    config_data = json.load(f)
+                cache_key = (os.path.abspath(config_file), os.path.getmtime(config_file))
+                cached = _CONFIG_CACHE.get(cache_key)
+                if cached is not None:
+                    return cached
+
+                with open(config_file, 'rb') as f:
+                    raw = f.read()
+                    config_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
                     logging.info(f"Loaded configuration from {config_file}")
                     
-                    # Validate and ensure all required fields exist
-                    validated_config = default_config.copy()
-                    validated_config.update({
-                        k: v for k, v in config_data.items() 
-                        if k in default_config
-                    })
-                    
+                    # Validate and ensure all required fields exist;
+                    # defaults and filtered file values merge into one
+                    # dict instead of copy-then-update
+                    defaults = cls.DEFAULT_CONFIG
+                    validated_config = {
+                        **defaults,
+                        **{k: v for k, v in config_data.items() if k in defaults}
+                    }
+
                     # Special handling for lists to ensure they're the right type
                     if not isinstance(validated_config.get("mod_directories", []), list):
-                        validated_config["mod_directories"] = default_config["mod_directories"]
-                        
+                        validated_config["mod_directories"] = defaults["mod_directories"]
+
                     if not isinstance(validated_config.get("ignore_mods", []), list):
-                        validated_config["ignore_mods"] = default_config["ignore_mods"]
-                    
-                    return cls(
+                        validated_config["ignore_mods"] = defaults["ignore_mods"]
+
+                    # Worker count must be a positive integer
+                    workers = validated_config.get("concurrent_downloads")
+                    if not isinstance(workers, int) or workers < 1:
+                        validated_config["concurrent_downloads"] = defaults["concurrent_downloads"]
+
+                    # Bandwidth budget must be a positive number
+                    bandwidth = validated_config.get("max_download_bandwidth_mbps")
+                    if not isinstance(bandwidth, (int, float)) or bandwidth <= 0:
+                        validated_config["max_download_bandwidth_mbps"] = defaults["max_download_bandwidth_mbps"]
+
+                    config = cls(
                         config_file=config_file,
                         mod_directories=validated_config.get("mod_directories"),
                         minecraft_version=validated_config.get("minecraft_version"),
@@ -102,8 +184,12 @@ class Config:
                         ignore_mods=validated_config.get("ignore_mods"),
                         default_mod_provider=validated_config.get("default_mod_provider"),
                         fallback_mod_provider=validated_config.get("fallback_mod_provider"),
-                        curseforge_api_key=validated_config.get("curseforge_api_key")
+                        curseforge_api_key=validated_config.get("curseforge_api_key"),
+                        concurrent_downloads=validated_config.get("concurrent_downloads"),
+                        max_download_bandwidth_mbps=validated_config.get("max_download_bandwidth_mbps")
                     )
+                    _CONFIG_CACHE[cache_key] = config
+                    return config
             else:
                 logging.warning(f"Configuration file {config_file} not found, using defaults")
                 
@@ -129,7 +215,10 @@ class Config:
     def save(self) -> bool:
         """
         Save configuration to file.
-        
+
+        The serialized content is hashed and compared against the last
+        write; an unchanged configuration skips the disk write entirely.
+
         Returns:
             True if save was successful, False otherwise
         """
@@ -142,20 +231,43 @@ class Config:
                 "ignore_mods": self.ignore_mods,
                 "default_mod_provider": self.default_mod_provider,
                 "fallback_mod_provider": self.fallback_mod_provider,
-                "curseforge_api_key": self.curseforge_api_key
+                "curseforge_api_key": self.curseforge_api_key,
+                "concurrent_downloads": self.concurrent_downloads,
+                "max_download_bandwidth_mbps": self.max_download_bandwidth_mbps
             }
-            
+
+            # Serialize once; the same string is hashed and written
+            if orjson is not None:
+                payload = orjson.dumps(config_data, option=orjson.OPT_INDENT_2).decode("utf-8")
+            else:
+                payload = json.dumps(config_data, indent=4)
+            payload_hash = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+            if payload_hash == self._last_saved_hash and os.path.exists(self.config_file):
+                logging.debug(f"Configuration unchanged, skipping save to {self.config_file}")
+                return True
+
             # Write to a temporary file first
             temp_file = f"{self.config_file}.tmp"
             with open(temp_file, 'w') as f:
-                json.dump(config_data, f, indent=4)
-            
+                f.write(payload)
+
             # Replace the original file with the temp file
             if os.path.exists(self.config_file):
                 os.replace(temp_file, self.config_file)
             else:
                 os.rename(temp_file, self.config_file)
                 
+            # Invalidate memoized loads of this file
+            abs_path = os.path.abspath(self.config_file)
+            for key in [k for k in _CONFIG_CACHE if k[0] == abs_path]:
+                del _CONFIG_CACHE[key]
+
+            self._last_saved_hash = payload_hash
+
+            # A saved config may have new mod_directories; drop the
+            # memoized directory resolutions so they get re-checked
+            _resolve_dir.cache_clear()
+
             logging.info(f"Configuration saved to {self.config_file}")
             return True
         except IOError as e:
@@ -165,18 +277,28 @@ class Config:
     def validate_mod_directories(self) -> List[str]:
         """
         Validate mod directories and return only those that exist.
-        
+
+        With more than a couple of directories the isdir checks are
+        overlapped on a thread pool; results keep configuration order
+        either way.
+
         Returns:
             List of valid directory paths
         """
+        # Each check is a filesystem stat, so parallelism only pays off
+        # once there are enough directories to hide the pool overhead
+        if len(self.mod_directories) > 2:
+            with ThreadPoolExecutor(max_workers=min(8, len(self.mod_directories))) as executor:
+                resolved_dirs = list(executor.map(_resolve_dir, self.mod_directories))
+        else:
+            resolved_dirs = [_resolve_dir(mod_dir) for mod_dir in self.mod_directories]
+
         valid_dirs = []
-        
-        for mod_dir in self.mod_directories:
-            abs_path = os.path.abspath(mod_dir)
-            if os.path.isdir(abs_path):
-                valid_dirs.append(abs_path)
+        for mod_dir, resolved in zip(self.mod_directories, resolved_dirs):
+            if resolved:
+                valid_dirs.append(resolved)
             else:
-                logging.warning(f"Invalid mod directory: {abs_path}")
+                logging.warning(f"Invalid mod directory: {os.path.abspath(mod_dir)}")
         
         if not valid_dirs:
             logging.warning("No valid mod directories found in configuration")
@@ -224,14 +346,19 @@ class Config:
         Returns:
             Normalized mod loader name
         """
+        cached = self._normalized_loader
+        if cached is not None and cached[0] == self.mod_loader:
+            return cached[1]
+
         loader = self.mod_loader.lower()
-        
-        if loader in ['fabric', 'forge', 'quilt']:
-            return loader
-        
-        # Default to fabric if invalid
-        logging.warning(f"Invalid mod loader: {loader}, defaulting to fabric")
-        return 'fabric'
+
+        if loader not in _VALID_LOADERS:
+            # Default to fabric if invalid
+            logging.warning(f"Invalid mod loader: {loader}, defaulting to fabric")
+            loader = 'fabric'
+
+        self._normalized_loader = (self.mod_loader, loader)
+        return loader
     
     @classmethod
     def create_interactive_config(cls, config_file: str = DEFAULT_CONFIG_FILE) -> 'Config':
@@ -6,8 +6,11 @@ for the application, including console and file handlers.
 """
 
 import os
+import queue
+import atexit
 import logging
 import datetime
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from typing import Optional
 from pathlib import Path
 
@@ -18,6 +21,29 @@ DEFAULT_LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 DEFAULT_LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 DEFAULT_LOG_DIRECTORY = "logs"
 
+# Records buffered in memory before the listener flushes them to disk
+LOG_BUFFER_CAPACITY = 1024
+
+# Background listener draining the log queue into the file handler
+_queue_listener: Optional[QueueListener] = None
+
+
+def _stop_queue_listener() -> None:
+    """
+    Flush and stop the background logging listener, if one is running.
+    """
+    global _queue_listener
+    if _queue_listener is not None:
+        try:
+            _queue_listener.stop()
+        except Exception:
+            pass
+        _queue_listener = None
+
+
+# Make sure buffered records reach the file on interpreter exit
+atexit.register(_stop_queue_listener)
+
 
 def setup_logging(
     log_dir: str = DEFAULT_LOG_DIRECTORY,
@@ -34,9 +60,14 @@ def setup_logging(
         debug_mode: Enable debug logging
         console_output: Enable console output
     """
+    global _queue_listener
+
     # Set root logger level
     root_logger = logging.getLogger()
-    
+
+    # Stop a listener left over from a previous setup call
+    _stop_queue_listener()
+
     # Clear any existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
@@ -64,12 +95,28 @@ def setup_logging(
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         log_file = os.path.join(log_dir, f"mod_updater_{timestamp}.log")
         
-        # Add file handler
+        # File records travel through a queue to a dedicated listener
+        # thread, so emit() on hot paths is a queue put instead of a
+        # locked, flushing disk write; a MemoryHandler in front of the
+        # file batches routine records and flushes promptly on warnings
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setFormatter(formatter)
         file_handler.setLevel(level)
-        root_logger.addHandler(file_handler)
-        
+
+        memory_handler = MemoryHandler(
+            capacity=LOG_BUFFER_CAPACITY,
+            flushLevel=logging.WARNING,
+            target=file_handler
+        )
+
+        log_queue = queue.SimpleQueue()
+        _queue_listener = QueueListener(log_queue, memory_handler, respect_handler_level=True)
+        _queue_listener.start()
+
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setLevel(level)
+        root_logger.addHandler(queue_handler)
+
         logging.info(f"Logging to {log_file}")
     except (IOError, OSError) as e:
         logging.error(f"Failed to set up file logging: {str(e)}")
@@ -123,6 +170,14 @@ def get_log_file_path() -> Optional[str]:
     for handler in root_logger.handlers:
         if isinstance(handler, logging.FileHandler):
             return handler.baseFilename
-    
+
+    # The file handler lives behind the queue listener, possibly
+    # wrapped in the buffering MemoryHandler
+    if _queue_listener is not None:
+        for handler in _queue_listener.handlers:
+            target = getattr(handler, "target", handler)
+            if isinstance(target, logging.FileHandler):
+                return target.baseFilename
+
     return None
 
@@ -6,13 +6,56 @@ to determine if updates are available for mods.
 """
 
 import re
+import sys
 import logging
-from typing import List, Tuple, Optional, Union
+from functools import lru_cache, total_ordering
+from typing import Iterable, List, Tuple, Optional
 
+# Patterns compiled once at import: version parsing runs for every mod
+# and every candidate release, and re.search with a string literal pays
+# a re._cache lookup on each call
+_MC_RE = re.compile(r'MC\d+\.\d+(\.\d+)?-([0-9.]+)')
+_DASH_RE = re.compile(r'[a-zA-Z]+-(\d+\.\d+(\.\d+)?)')
+_HAS_DIGIT_RE = re.compile(r'\d')
 
+# Known prerelease tags for styles like "1.2.3_alpha1"; matched by hand
+# against a lowercased copy, which beats an ignore-case regex that pays
+# the case folding per character
+_PRERELEASE_TAGS = ('alpha', 'beta', 'pre', 'rc', 'snapshot')
+_TAG_SEPARATORS = '._-'
+
+# Only plausibly real version strings are interned; anything longer is
+# more likely junk that should stay collectable
+_INTERN_MAX_LEN = 50
+
+# Maps every ASCII non-digit to '.', turning component splitting into a
+# C-level translate + split instead of a regex pass
+_NONDIGIT_TRANS = str.maketrans({chr(c): '.' for c in range(128) if not chr(c).isdigit()})
+
+
+def _is_plain_numeric(version: str) -> bool:
+    """
+    Check whether a version is plain dotted digits like "1.2.3".
+
+    Args:
+        version: Version string to check
+
+    Returns:
+        True if the string contains only digits and dots
+    """
+    # The overwhelmingly common shape; isdigit rejects the empty string
+    return version.replace('.', '').isdigit()
+
+
+@total_ordering
 class Version:
     """Class representing a parsed version."""
-    
+
+    # Thousands of these are alive during a scan, and the comparison
+    # operators read several attributes per call; slots drop the
+    # per-instance dict and make those reads offset loads
+    __slots__ = ("original", "normalized", "components", "prerelease", "build")
+
     def __init__(self, version_string: str):
         """
         Initialize a Version object.
@@ -22,12 +65,20 @@ class Version:
         """
         self.original = version_string
         self.normalized = normalize_version(version_string)
-        
-        # Parse the normalized version into components
-        self.components = parse_version(self.normalized)
-        
-        # Extract pre-release and build info
-        self.prerelease, self.build = extract_prerelease_and_build(self.normalized)
+
+        # Plain dotted digits — the common case — need no regex work at
+        # all; anything with letters, dashes or build metadata takes the
+        # full parsing path
+        if _is_plain_numeric(self.normalized):
+            self.components = tuple(int(p) for p in self.normalized.split('.') if p) or (0,)
+            self.prerelease = None
+            self.build = None
+        else:
+            # Parse the normalized version into components
+            self.components = parse_version(self.normalized)
+
+            # Extract pre-release and build info
+            self.prerelease, self.build = extract_prerelease_and_build(self.normalized)
     
     def __str__(self) -> str:
         return self.original
@@ -38,10 +89,12 @@ class Version:
     def __eq__(self, other) -> bool:
         if not isinstance(other, Version):
             return NotImplemented
-        
+
+        # Build metadata carries no precedence (SemVer ignores it), and
+        # __lt__ never consults it; including it here would leave two
+        # builds of the same version neither equal nor ordered
         return (self.components == other.components and
-                self.prerelease == other.prerelease and
-                self.build == other.build)
+                self.prerelease == other.prerelease)
     
     def __lt__(self, other) -> bool:
         if not isinstance(other, Version):
@@ -64,24 +117,19 @@ class Version:
         
         # If we get here, the versions are equal (ignoring build metadata)
         return False
-    
-    def __gt__(self, other) -> bool:
-        if not isinstance(other, Version):
-            return NotImplemented
-        
-        return other < self
-    
-    def __le__(self, other) -> bool:
-        if not isinstance(other, Version):
-            return NotImplemented
-        
-        return self < other or self == other
-    
-    def __ge__(self, other) -> bool:
-        if not isinstance(other, Version):
-            return NotImplemented
-        
-        return self > other or self == other
+
+    def __hash__(self) -> int:
+        # Components are a tuple, so parsed versions can key dicts and
+        # sets; consistent with __eq__, which ignores the original text
+        # and the build metadata
+        return hash((self.components, self.prerelease))
+
+
+# The same version strings recur across mods and runs (popular mods,
+# shared Minecraft targets); parsing allocates several lists and regex
+# matches, so constructed Version objects are memoized. Instances are
+# immutable after construction, making them safe to share.
+_parse_version_cached = lru_cache(maxsize=4096)(Version)
 
 
 def normalize_version(version: str) -> str:
@@ -94,53 +142,65 @@ def normalize_version(version: str) -> str:
     Returns:
         Normalized version string
     """
-    # Remove any 'v' prefix
-    if version.lower().startswith('v'):
+    # Remove any 'v' prefix; checking the first character directly
+    # avoids lowercasing the whole string just to inspect one byte
+    if version and version[0] in ('v', 'V'):
         version = version[1:]
-    
-    # Handle specific patterns:
+
+    # Plain dotted digits are already normalized; interning collapses
+    # the many duplicate values across a mod list into one object, so
+    # later equality checks short-circuit on identity
+    if _is_plain_numeric(version):
+        return sys.intern(version)
+
+    # Handle specific patterns, dispatching on cheap substring checks so
+    # a regex only runs when its anchor text is actually present:
     # MC version patterns like "MC1.19.2-1.0.0" -> "1.0.0"
-    mc_pattern = re.search(r'MC\d+\.\d+(\.\d+)?-([0-9.]+)', version)
-    if mc_pattern:
-        version = mc_pattern.group(2)
-    
+    if 'MC' in version:
+        mc_pattern = _MC_RE.search(version)
+        if mc_pattern:
+            version = mc_pattern.group(2)
+
     # Handle patterns like "mod-1.2.3" -> "1.2.3"
-    dash_pattern = re.search(r'[a-zA-Z]+-(\d+\.\d+(\.\d+)?)', version)
-    if dash_pattern:
-        version = dash_pattern.group(1)
+    if '-' in version:
+        dash_pattern = _DASH_RE.search(version)
+        if dash_pattern:
+            version = dash_pattern.group(1)
     
     # Trim whitespace
     version = version.strip()
-    
+
+    if len(version) <= _INTERN_MAX_LEN:
+        version = sys.intern(version)
+
     return version
 
 
-def parse_version(version: str) -> List[int]:
+def parse_version(version: str) -> Tuple[int, ...]:
     """
     Parse a version string into numeric components.
-    
+
     Args:
         version: Normalized version string
-        
+
     Returns:
-        List of integer version components
+        Tuple of integer version components; tuples rich-compare faster
+        than lists and are hashable for cache keys
     """
-    # Split on non-numeric characters, but stop at prerelease or build indicators
-    prerelease_index = version.find('-')
-    build_index = version.find('+')
-    
-    # Find where to stop parsing numeric components
+    # Numeric components stop at the first prerelease or build
+    # indicator; one scan finds whichever comes first
     end_index = len(version)
-    if prerelease_index != -1:
-        end_index = min(end_index, prerelease_index)
-    if build_index != -1:
-        end_index = min(end_index, build_index)
-    
+    for i, char in enumerate(version):
+        if char == '-' or char == '+':
+            end_index = i
+            break
+
     # Extract and parse the numeric part
     numeric_part = version[:end_index]
     
-    # Split on non-numeric characters
-    version_parts = re.split(r'[^0-9]+', numeric_part)
+    # Split on non-numeric characters; the empty tokens produced by
+    # consecutive separators are skipped by the loop below
+    version_parts = numeric_part.translate(_NONDIGIT_TRANS).split('.')
     
     # Convert to integers, ignoring empty parts
     components = []
@@ -151,11 +211,8 @@ def parse_version(version: str) -> List[int]:
             except ValueError:
                 continue  # Skip non-numeric parts
     
-    # If no components, add a 0 to avoid empty lists
-    if not components:
-        components = [0]
-    
-    return components
+    # If no components, fall back to a single 0
+    return tuple(components) or (0,)
 
 
 def extract_prerelease_and_build(version: str) -> Tuple[Optional[str], Optional[str]]:
@@ -168,46 +225,84 @@ def extract_prerelease_and_build(version: str) -> Tuple[Optional[str], Optional[
     Returns:
         Tuple of (prerelease string or None, build string or None)
     """
-    prerelease = None
-    build = None
-    
-    # Check for semver style prerelease: 1.2.3-alpha.1
-    prerelease_match = re.search(r'-([a-zA-Z0-9.-]+)(?:\+|$)', version)
-    if prerelease_match:
-        prerelease = prerelease_match.group(1)
-    
-    # Check for semver style build metadata: 1.2.3+build.5
-    build_match = re.search(r'\+([a-zA-Z0-9.-]+)$', version)
-    if build_match:
-        build = build_match.group(1)
+    # Semver places build metadata after the last '+' and prerelease
+    # after the first '-' before it ("1.2.3-alpha.1+build.5"); plain
+    # find/slice handles both in one pass over the string instead of
+    # two regex searches
+    plus = version.rfind('+')
+    if plus != -1:
+        build = version[plus + 1:] or None
+        rest = version[:plus]
+    else:
+        build = None
+        rest = version
+
+    dash = rest.find('-')
+    prerelease = (rest[dash + 1:] or None) if dash != -1 else None
     
-    # Also check for other common patterns:
+    # Also check for other common patterns like "1.2.3_alpha1": the
+    # leftmost known tag preceded by a separator wins, mirroring what
+    # the old ignore-case regex matched
     if not prerelease:
-        # Check for patterns like "1.2.3_alpha1"
-        alt_match = re.search(r'[._-](alpha|beta|pre|rc|snapshot)[._-]?(\d*)', version, re.IGNORECASE)
-        if alt_match:
-            type_str = alt_match.group(1).lower()
-            num_str = alt_match.group(2) or '0'
-            prerelease = f"{type_str}.{num_str}"
+        lowered = version.lower()
+        best_index = -1
+        best_tag = None
+        for tag in _PRERELEASE_TAGS:
+            start = 0
+            while True:
+                index = lowered.find(tag, start)
+                if index == -1:
+                    break
+                if index > 0 and lowered[index - 1] in _TAG_SEPARATORS:
+                    if best_index == -1 or index < best_index:
+                        best_index, best_tag = index, tag
+                    break
+                start = index + 1
+
+        if best_tag is not None:
+            # Optional separator, then any trailing digits
+            i = best_index + len(best_tag)
+            if i < len(lowered) and lowered[i] in _TAG_SEPARATORS:
+                i += 1
+            j = i
+            while j < len(lowered) and lowered[j].isdigit():
+                j += 1
+            prerelease = f"{best_tag}.{lowered[i:j] or '0'}"
     
     return prerelease, build
 
 
+@lru_cache(maxsize=4096)
 def compare_versions(current_version: str, latest_version: str) -> bool:
     """
     Compare version strings to determine if an update is available.
-    
+
+    The result is memoized per (current, latest) pair: refreshes of the
+    same mod list re-ask the same questions, and the answer is a pure
+    function of the two strings.
+
     Args:
         current_version: Current version string
         latest_version: Latest version string
-        
+
     Returns:
         True if an update is available, False otherwise
     """
+    # Identical strings are the common no-update answer; skip parsing
+    if current_version == latest_version:
+        return False
+
+    # A string without a single digit has nothing for the parser to work
+    # with; send it straight to the fallback instead of building Version
+    # objects that would compare as all-zero
+    if (_HAS_DIGIT_RE.search(current_version) is None
+            or _HAS_DIGIT_RE.search(latest_version) is None):
+        return _simple_version_compare(current_version, latest_version)
+
     try:
-        current = Version(current_version)
-        latest = Version(latest_version)
-        
+        current = _parse_version_cached(current_version)
+        latest = _parse_version_cached(latest_version)
+
         # If the latest version is greater than the current version, an update is available
         return latest > current
     except Exception as e:
@@ -217,6 +312,34 @@ def compare_versions(current_version: str, latest_version: str) -> bool:
         return _simple_version_compare(current_version, latest_version)
 
 
+def compare_versions_many(pairs: Iterable[Tuple[str, str]]) -> List[bool]:
+    """
+    Compare many (current, latest) version pairs in one call.
+
+    Each distinct string is parsed once up front, so pairs sharing
+    versions — common when many mods target the same release — reuse
+    the parse instead of repeating it per pair.
+
+    Args:
+        pairs: Iterable of (current_version, latest_version) tuples
+
+    Returns:
+        List of booleans, True where an update is available, in input
+        order
+    """
+    pairs = list(pairs)
+
+    # Warm the Version cache with each distinct parseable string
+    for version in {s for pair in pairs for s in pair}:
+        if _HAS_DIGIT_RE.search(version):
+            try:
+                _parse_version_cached(version)
+            except Exception:
+                pass
+
+    return [compare_versions(current, latest) for current, latest in pairs]
+
+
 def _simple_version_compare(current_version: str, latest_version: str) -> bool:
     """
     Simple fallback version comparison.
@@ -240,38 +363,40 @@ def _simple_version_compare(current_version: str, latest_version: str) -> bool:
     try:
         current_parts = parse_version(current)
         latest_parts = parse_version(latest)
-        
-        # Compare each component
-        for i in range(max(len(current_parts), len(latest_parts))):
-            current_part = current_parts[i] if i < len(current_parts) else 0
-            latest_part = latest_parts[i] if i < len(latest_parts) else 0
-            
-            if latest_part > current_part:
-                return True
-            elif latest_part < current_part:
-                return False
-        
-        # All components are equal
-        return False
+
+        # Zero-pad to equal length and let tuple comparison handle the
+        # component walk in C instead of an index loop
+        width = max(len(current_parts), len(latest_parts))
+        current_parts += (0,) * (width - len(current_parts))
+        latest_parts += (0,) * (width - len(latest_parts))
+        return latest_parts > current_parts
     except Exception:
         # If parsing fails, just do a string comparison
         # This is very simplistic and might not be accurate
         return current != latest
 
 
+@lru_cache(maxsize=2048)
 def is_valid_version(version: str) -> bool:
     """
     Check if a string is a valid version.
-    
+
+    Memoized: validation loops tend to re-ask about the same strings,
+    and the answer never changes for a given input.
+
     Args:
         version: Version string to validate
-        
+
     Returns:
         True if the version is valid, False otherwise
     """
     if not version:
         return False
-    
+
+    # Plain dotted digits are trivially valid
+    if _is_plain_numeric(version):
+        return True
+
     normalized = normalize_version(version)
     
     # A valid version should have at least one numeric component